@@ -0,0 +1,30 @@
+import random
+import sys
+import time
+
+from lru_sim import CacheSimulator
+from lru_sim_slot import CacheSimulatorSlot
+
+
+def bench(sim_class, cache_slots, accesses, seed=0):
+    # 캐시 크기의 2배 범위에서 균등하게 접근해 적중과 축출이 모두 일어나게 한다
+    rng = random.Random(seed)
+    pages = [rng.randrange(cache_slots * 2) for _ in range(accesses)]
+    cache_sim = sim_class(cache_slots)
+    start = time.perf_counter()
+    for page in pages:
+        cache_sim.do_sim(page)
+    elapsed = time.perf_counter() - start
+    return elapsed / accesses * 1e9, cache_sim.cache_hit / cache_sim.tot_cnt
+
+
+if __name__ == "__main__":
+    accesses = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    for cache_slots in (100, 1000, 10000, 100000, 1000000):
+        ns, ratio = bench(CacheSimulatorSlot, cache_slots, accesses)
+        line = "cache_slot = {:>8} slot: {:7.1f} ns/access (hit ratio {:.3f})".format(cache_slots, ns, ratio)
+        if cache_slots <= 10000:
+            # 리스트 기반 CacheSimulator 는 큰 캐시에서 너무 느려 작은 크기만 비교
+            list_ns, _ = bench(CacheSimulator, cache_slots, min(accesses, 20000))
+            line += " list: {:10.1f} ns/access".format(list_ns)
+        print(line)
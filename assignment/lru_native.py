@@ -0,0 +1,81 @@
+import ctypes
+import os
+import subprocess
+from array import array
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+SOURCE = os.path.join(HERE, "lru_sim.c")
+LIBRARY = os.path.join(HERE, "liblru_sim.so")
+
+_lib = None
+
+
+def build(force=False):
+    # 공유 라이브러리가 없거나 lru_sim.c 보다 오래되었으면 cc 로 다시 빌드
+    if not force and os.path.exists(LIBRARY) and os.path.getmtime(LIBRARY) >= os.path.getmtime(SOURCE):
+        return LIBRARY
+    cc = os.environ.get("CC", "cc")
+    subprocess.check_call([cc, "-O2", "-shared", "-fPIC", "-o", LIBRARY, SOURCE])
+    return LIBRARY
+
+
+def load():
+    global _lib
+    if _lib is None:
+        lib = ctypes.CDLL(build())
+        lib.lru_create.argtypes = [ctypes.c_int]
+        lib.lru_create.restype = ctypes.c_void_p
+        lib.lru_destroy.argtypes = [ctypes.c_void_p]
+        lib.lru_destroy.restype = None
+        lib.lru_access.argtypes = [ctypes.c_void_p, ctypes.c_int64]
+        lib.lru_access.restype = ctypes.c_int
+        lib.lru_sim_batch.argtypes = [ctypes.c_void_p, ctypes.c_void_p, ctypes.c_size_t]
+        lib.lru_sim_batch.restype = ctypes.c_longlong
+        lib.lru_cache_hit.argtypes = [ctypes.c_void_p]
+        lib.lru_cache_hit.restype = ctypes.c_longlong
+        lib.lru_tot_cnt.argtypes = [ctypes.c_void_p]
+        lib.lru_tot_cnt.restype = ctypes.c_longlong
+        _lib = lib
+    return _lib
+
+
+class CacheSimulatorNative:
+    # lru_sim.c 의 LRU 엔진을 감싼 클래스. do_sim_batch() 로 int64 트레이스 전체를 한 번에 넘긴다.
+    def __init__(self, cache_slots):
+        self.lib = load()
+        self.cache_slots = cache_slots
+        self.sim = self.lib.lru_create(cache_slots)
+        if not self.sim:
+            raise MemoryError("lru_create failed")
+
+    def __del__(self):
+        if getattr(self, "sim", None):
+            self.lib.lru_destroy(self.sim)
+            self.sim = None
+
+    @property
+    def cache_hit(self):
+        return self.lib.lru_cache_hit(self.sim)
+
+    @property
+    def tot_cnt(self):
+        return self.lib.lru_tot_cnt(self.sim)
+
+    def do_sim(self, page):
+        self.lib.lru_access(self.sim, page)
+
+    def do_sim_batch(self, pages):
+        # array('q') 는 복사 없이 넘기고, mmap 위의 memoryview 는 memcpy 한 번으로 옮긴다
+        if isinstance(pages, memoryview) and pages.format == 'q':
+            buffer = array('q')
+            buffer.frombytes(pages.cast("B"))
+            pages = buffer
+        elif not isinstance(pages, array) or pages.typecode != 'q':
+            pages = array('q', pages)
+        if not pages:
+            return 0
+        address, count = pages.buffer_info()
+        return self.lib.lru_sim_batch(self.sim, address, count)
+
+    def print_status(self):
+        print("cache_slot =", self.cache_slots, "cache_hit =", self.cache_hit, "hit ratio =", self.cache_hit / self.tot_cnt)
@@ -1,88 +1,243 @@
+#include <stdint.h>
 #include <stdio.h>
 #include <stdlib.h>
 #include <string.h>
 
-#define CACHE_SLOTS 1000
+/*
+ * LRU 캐시 시뮬레이터
+ * - 해시 테이블: 선형 탐사 오픈 어드레싱 (page -> slot), 삭제는 backward shift
+ * - 최근성 리스트: slot 번호로 연결된 이중 연결 리스트, 적중/승격/축출 모두 O(1)
+ * Python 에서는 ctypes 로 lru_sim_batch() 를 불러 int64 페이지 배열 전체를 한 번에 넘긴다.
+ */
 
-typedef struct Node {
-    char *data;
-    struct Node *next;
-} Node;
+#define EMPTY (-1)
 
 typedef struct {
     int cache_slots;
-    Node *cache[CACHE_SLOTS];
-    Node *head;
-    Node *tail;
-    int cache_hit;
-    int tot_cnt;
-} CacheSimulatorLinkedList;
-
-void init_cache_simulator(CacheSimulatorLinkedList *cache_sim, int cache_slots) {
-    cache_sim->cache_slots = cache_slots;
-    cache_sim->head = NULL;
-    cache_sim->tail = NULL;
-    cache_sim->cache_hit = 0;
-    cache_sim->tot_cnt = 0;
-    for (int i = 0; i < CACHE_SLOTS; i++) {
-        cache_sim->cache[i] = NULL;
+    int used;
+    int head;              /* MRU slot */
+    int tail;              /* LRU slot */
+    int64_t *pages;        /* slot -> page */
+    int32_t *prev;
+    int32_t *next;
+    int32_t *table;        /* 해시 버킷 -> slot */
+    uint64_t mask;
+    long long cache_hit;
+    long long tot_cnt;
+} CacheSimulator;
+
+static uint64_t mix(uint64_t x) {
+    x ^= x >> 33;
+    x *= 0xff51afd7ed558ccdULL;
+    x ^= x >> 33;
+    x *= 0xc4ceb9fe1a85ec53ULL;
+    x ^= x >> 33;
+    return x;
+}
+
+CacheSimulator *lru_create(int cache_slots) {
+    CacheSimulator *sim = calloc(1, sizeof(CacheSimulator));
+    if (sim == NULL) {
+        return NULL;
+    }
+    uint64_t buckets = 2;
+    while (buckets < (uint64_t)cache_slots * 2) {
+        buckets <<= 1;
     }
+    sim->cache_slots = cache_slots;
+    sim->head = EMPTY;
+    sim->tail = EMPTY;
+    sim->mask = buckets - 1;
+    sim->pages = malloc(sizeof(int64_t) * cache_slots);
+    sim->prev = malloc(sizeof(int32_t) * cache_slots);
+    sim->next = malloc(sizeof(int32_t) * cache_slots);
+    sim->table = malloc(sizeof(int32_t) * buckets);
+    if (sim->pages == NULL || sim->prev == NULL || sim->next == NULL || sim->table == NULL) {
+        free(sim->pages);
+        free(sim->prev);
+        free(sim->next);
+        free(sim->table);
+        free(sim);
+        return NULL;
+    }
+    memset(sim->table, 0xff, sizeof(int32_t) * buckets); /* 모두 EMPTY */
+    return sim;
 }
 
-void do_sim(CacheSimulatorLinkedList *cache_sim, char *page) {
-    cache_sim->tot_cnt++;
-    int idx = atoi(page) % cache_sim->cache_slots;
-    if (cache_sim->cache[idx] != NULL && cache_sim->cache[idx]->data != NULL && strcmp(cache_sim->cache[idx]->data, page) == 0) {
-        cache_sim->cache_hit++;
-        Node *node = cache_sim->cache[idx];
-        if (node != cache_sim->head) {
-            if (node == cache_sim->tail) {
-                cache_sim->tail = cache_sim->tail->next;
-            }
-            node->next = NULL;
-            cache_sim->head->next = node;
-            cache_sim->head = node;
+void lru_destroy(CacheSimulator *sim) {
+    if (sim == NULL) {
+        return;
+    }
+    free(sim->pages);
+    free(sim->prev);
+    free(sim->next);
+    free(sim->table);
+    free(sim);
+}
+
+static uint64_t find_bucket(CacheSimulator *sim, int64_t page) {
+    uint64_t b = mix((uint64_t)page) & sim->mask;
+    while (sim->table[b] != EMPTY && sim->pages[sim->table[b]] != page) {
+        b = (b + 1) & sim->mask;
+    }
+    return b;
+}
+
+static void table_remove(CacheSimulator *sim, uint64_t b) {
+    /* 선형 탐사 삭제: 뒤따르는 항목을 당겨 와서 탐사 경로를 유지한다 */
+    uint64_t hole = b;
+    uint64_t j = b;
+    for (;;) {
+        j = (j + 1) & sim->mask;
+        int32_t slot = sim->table[j];
+        if (slot == EMPTY) {
+            break;
         }
-    } else {
-        if (cache_sim->cache[idx] != NULL) {
-            free(cache_sim->cache[idx]->data); // 데이터 해제
-            free(cache_sim->cache[idx]); // 노드 해제
+        uint64_t home = mix((uint64_t)sim->pages[slot]) & sim->mask;
+        if (((j - home) & sim->mask) >= ((j - hole) & sim->mask)) {
+            sim->table[hole] = slot;
+            hole = j;
         }
-        Node *new_node = (Node *)malloc(sizeof(Node));
-        new_node->data = strdup(page);
-        new_node->next = NULL;
-        cache_sim->cache[idx] = new_node;
-        if (cache_sim->head == NULL) {
-            cache_sim->head = new_node;
-            cache_sim->tail = new_node;
-        } else {
-            cache_sim->head->next = new_node;
-            cache_sim->head = new_node;
+    }
+    sim->table[hole] = EMPTY;
+}
+
+static void unlink_slot(CacheSimulator *sim, int slot) {
+    int p = sim->prev[slot];
+    int n = sim->next[slot];
+    if (p != EMPTY) {
+        sim->next[p] = n;
+    } else {
+        sim->head = n;
+    }
+    if (n != EMPTY) {
+        sim->prev[n] = p;
+    } else {
+        sim->tail = p;
+    }
+}
+
+static void push_front(CacheSimulator *sim, int slot) {
+    sim->prev[slot] = EMPTY;
+    sim->next[slot] = sim->head;
+    if (sim->head != EMPTY) {
+        sim->prev[sim->head] = slot;
+    }
+    sim->head = slot;
+    if (sim->tail == EMPTY) {
+        sim->tail = slot;
+    }
+}
+
+int lru_access(CacheSimulator *sim, int64_t page) {
+    sim->tot_cnt++;
+    uint64_t b = find_bucket(sim, page);
+    int slot = sim->table[b];
+    if (slot != EMPTY) {
+        sim->cache_hit++;
+        if (slot != sim->head) {
+            unlink_slot(sim, slot);
+            push_front(sim, slot);
         }
+        return 1;
     }
+    if (sim->cache_slots <= 0) {
+        return 0;
+    }
+    if (sim->used < sim->cache_slots) {
+        slot = sim->used++;
+    } else {
+        /* LRU 슬롯을 축출하고 재사용. 해시 항목을 지우면 b 가 바뀔 수 있어 다시 찾는다 */
+        slot = sim->tail;
+        unlink_slot(sim, slot);
+        table_remove(sim, find_bucket(sim, sim->pages[slot]));
+        b = find_bucket(sim, page);
+    }
+    sim->pages[slot] = page;
+    sim->table[b] = slot;
+    push_front(sim, slot);
+    return 0;
+}
+
+long long lru_sim_batch(CacheSimulator *sim, const int64_t *pages, size_t n) {
+    long long before = sim->cache_hit;
+    for (size_t i = 0; i < n; i++) {
+        lru_access(sim, pages[i]);
+    }
+    return sim->cache_hit - before;
+}
+
+long long lru_cache_hit(CacheSimulator *sim) {
+    return sim->cache_hit;
+}
+
+long long lru_tot_cnt(CacheSimulator *sim) {
+    return sim->tot_cnt;
 }
 
-void print_status(CacheSimulatorLinkedList *cache_sim) {
-    printf("cache_slot = %d cache_hit = %d hit ratio = %lf\n", cache_sim->cache_slots, cache_sim->cache_hit, (double)cache_sim->cache_hit / cache_sim->tot_cnt);
+void print_status(CacheSimulator *sim) {
+    printf("cache_slot = %d cache_hit = %lld hit ratio = %lf\n", sim->cache_slots, sim->cache_hit, (double)sim->cache_hit / sim->tot_cnt);
 }
 
-int main() {
-    FILE *data_file = fopen("/Users/imin-yeong/Documents/2024/자료구조/linkbench.trc", "r");
+static int64_t parse_page(const char *token) {
+    char *end;
+    long long value = strtoll(token, &end, 10);
+    if (end != token && (*end == '\0' || *end == ' ' || *end == '\t' || *end == '\n' || *end == '\r')) {
+        return value;
+    }
+    /* 숫자가 아닌 페이지 ID 는 FNV-1a 해시를 음수 영역으로 옮겨 쓴다 */
+    uint64_t h = 1469598103934665603ULL;
+    for (const char *c = token; *c && *c != ' ' && *c != '\t' && *c != '\n' && *c != '\r'; c++) {
+        h = (h ^ (unsigned char)*c) * 1099511628211ULL;
+    }
+    return -(int64_t)(h >> 1) - 1;
+}
+
+int main(int argc, char **argv) {
+    const char *path = argc > 1 ? argv[1] : "./linkbench.trc";
+    FILE *data_file = fopen(path, "r");
     if (data_file == NULL) {
         printf("Error opening file\n");
         return 1;
     }
+    /* 트레이스를 한 번만 파싱해 int64 배열로 들고 크기별로 재생한다 */
+    size_t count = 0;
+    size_t capacity = 1 << 16;
+    int64_t *pages = malloc(sizeof(int64_t) * capacity);
     char line[255];
-    CacheSimulatorLinkedList cache_sim;
-    for (int cache_slots = 100; cache_slots <= 1000; cache_slots += 100) {
-        init_cache_simulator(&cache_sim, cache_slots);
-        while (fgets(line, sizeof(line), data_file)) {
-            char *page = strtok(line, " ");
-            do_sim(&cache_sim, page);
+    while (pages != NULL && fgets(line, sizeof(line), data_file)) {
+        const char *token = line + strspn(line, " \t");
+        if (*token == '\n' || *token == '\r' || *token == '\0') {
+            continue;
+        }
+        if (count == capacity) {
+            capacity *= 2;
+            int64_t *grown = realloc(pages, sizeof(int64_t) * capacity);
+            if (grown == NULL) {
+                free(pages);
+                pages = NULL;
+                break;
+            }
+            pages = grown;
         }
-        fseek(data_file, 0, SEEK_SET);
-        print_status(&cache_sim);
+        pages[count++] = parse_page(token);
     }
     fclose(data_file);
+    if (pages == NULL) {
+        printf("Out of memory\n");
+        return 1;
+    }
+    for (int cache_slots = 100; cache_slots <= 1000; cache_slots += 100) {
+        CacheSimulator *sim = lru_create(cache_slots);
+        if (sim == NULL) {
+            printf("Out of memory\n");
+            free(pages);
+            return 1;
+        }
+        lru_sim_batch(sim, pages, count);
+        print_status(sim);
+        lru_destroy(sim);
+    }
+    free(pages);
     return 0;
 }
@@ -1,3 +1,7 @@
+import sys
+
+from trace_io import load_pages_cached
+
 class CacheSimulator:
     def __init__(self, cache_slots):
         self.cache_slots = cache_slots
@@ -5,6 +9,9 @@ class CacheSimulator:
         self.cache_hit = 0
         self.tot_cnt = 0
 
+    def __len__(self):
+        return len(self.cache)
+
     def do_sim(self, page):
         self.tot_cnt += 1
         if page in self.cache:
@@ -20,12 +27,18 @@ class CacheSimulator:
         print("cache_slot =", self.cache_slots, "cache_hit =", self.cache_hit, "hit ratio =", self.cache_hit / self.tot_cnt)
 
 if __name__ == "__main__":
-    data_file = open("./linkbench.trc")
-    lines = data_file.readlines()
+    pages, _ = load_pages_cached("./linkbench.trc")
+    native = "--native" in sys.argv
+    if native:
+        from lru_native import CacheSimulatorNative
     for cache_slots in range(100, 1001, 100):
-        cache_sim = CacheSimulator(cache_slots)
-        for line in lines:
-            page = line.split()[0]
-            cache_sim.do_sim(page)
+        if native:
+            # C 엔진에 파싱된 트레이스 전체를 한 번에 넘긴다
+            cache_sim = CacheSimulatorNative(cache_slots)
+            cache_sim.do_sim_batch(pages)
+        else:
+            cache_sim = CacheSimulator(cache_slots)
+            for page in pages:
+                cache_sim.do_sim(page)
         cache_sim.print_status()
 
@@ -1,3 +1,5 @@
+from trace_io import load_pages_cached
+
 class Node:
     def __init__(self, data):
         self.data = data
@@ -12,6 +14,9 @@ class CacheSimulatorLinkedList:
         self.cache_hit = 0
         self.tot_cnt = 0
 
+    def __len__(self):
+        return len(self.cache)
+
     def do_sim(self, page):
         self.tot_cnt += 1
         if page in self.cache:
@@ -40,11 +45,9 @@ class CacheSimulatorLinkedList:
         print("cache_slot =", self.cache_slots, "cache_hit =", self.cache_hit, "hit ratio =", self.cache_hit / self.tot_cnt)
 
 if __name__ == "__main__":
-    data_file = open("./linkbench.trc")
-    lines = data_file.readlines()
+    pages, _ = load_pages_cached("./linkbench.trc")
     for cache_slots in range(100, 1001, 100):
         cache_sim = CacheSimulatorLinkedList(cache_slots)
-        for line in lines:
-            page = line.split()[0]
+        for page in pages:
             cache_sim.do_sim(page)
         cache_sim.print_status()
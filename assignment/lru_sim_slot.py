@@ -0,0 +1,66 @@
+from array import array
+
+from trace_io import load_pages_cached
+
+
+class CacheSimulatorSlot:
+    # 슬롯 번호 기반 이중 연결 리스트 LRU: 적중/승격/축출 모두 O(1)
+    # prev/next 는 정수 배열이고, 마지막 슬롯(cache_slots)은 머리 센티넬이다.
+    def __init__(self, cache_slots):
+        self.cache_slots = cache_slots
+        self.cache = {}  # page -> slot
+        self.pages = [None] * cache_slots  # slot -> page
+        self.prev = array('q', [cache_slots]) * (cache_slots + 1)
+        self.next = array('q', [cache_slots]) * (cache_slots + 1)
+        self.used = 0
+        self.cache_hit = 0
+        self.tot_cnt = 0
+
+    def _unlink(self, slot):
+        prev, next = self.prev, self.next
+        p = prev[slot]
+        n = next[slot]
+        next[p] = n
+        prev[n] = p
+
+    def _push_front(self, slot):
+        prev, next = self.prev, self.next
+        head = self.cache_slots
+        first = next[head]
+        prev[slot] = head
+        next[slot] = first
+        prev[first] = slot
+        next[head] = slot
+
+    def __len__(self):
+        return len(self.cache)
+
+    def do_sim(self, page):
+        self.tot_cnt += 1
+        slot = self.cache.get(page)
+        if slot is not None:
+            self.cache_hit += 1
+            self._unlink(slot)
+            self._push_front(slot)
+            return
+        if self.used < self.cache_slots:
+            slot = self.used
+            self.used += 1
+        else:
+            slot = self.prev[self.cache_slots]  # LRU 슬롯을 재사용
+            del self.cache[self.pages[slot]]
+            self._unlink(slot)
+        self.pages[slot] = page
+        self.cache[page] = slot
+        self._push_front(slot)
+
+    def print_status(self):
+        print("cache_slot =", self.cache_slots, "cache_hit =", self.cache_hit, "hit ratio =", self.cache_hit / self.tot_cnt)
+
+if __name__ == "__main__":
+    pages, _ = load_pages_cached("./linkbench.trc")
+    for cache_slots in range(100, 1001, 100):
+        cache_sim = CacheSimulatorSlot(cache_slots)
+        for page in pages:
+            cache_sim.do_sim(page)
+        cache_sim.print_status()
@@ -0,0 +1,366 @@
+import heapq
+import sys
+from array import array
+from collections import OrderedDict, deque
+
+from lru_sim_slot import CacheSimulatorSlot
+from trace_io import load_pages_cached
+
+
+class Policy:
+    # 모든 교체 정책의 공통 인터페이스: do_sim(page) / print_status()
+    name = None
+
+    def __init__(self, cache_slots):
+        self.cache_slots = cache_slots
+        self.cache_hit = 0
+        self.tot_cnt = 0
+
+    def do_sim(self, page):
+        raise NotImplementedError
+
+    def print_status(self):
+        print("policy =", self.name, "cache_slot =", self.cache_slots, "cache_hit =", self.cache_hit, "hit ratio =", self.cache_hit / self.tot_cnt)
+
+
+class LRU(CacheSimulatorSlot):
+    name = "LRU"
+    print_status = Policy.print_status
+
+
+class FIFO(Policy):
+    name = "FIFO"
+
+    def __init__(self, cache_slots):
+        super().__init__(cache_slots)
+        self.cache = set()
+        self.queue = deque()
+
+    def __len__(self):
+        return len(self.cache)
+
+    def do_sim(self, page):
+        self.tot_cnt += 1
+        if page in self.cache:
+            self.cache_hit += 1
+            return
+        if len(self.cache) >= self.cache_slots:
+            self.cache.remove(self.queue.popleft())
+        self.cache.add(page)
+        self.queue.append(page)
+
+
+class CLOCK(Policy):
+    name = "CLOCK"
+
+    def __init__(self, cache_slots):
+        super().__init__(cache_slots)
+        self.cache = {}  # page -> slot
+        self.pages = [None] * cache_slots
+        self.ref = bytearray(cache_slots)
+        self.hand = 0
+
+    def __len__(self):
+        return len(self.cache)
+
+    def do_sim(self, page):
+        self.tot_cnt += 1
+        slot = self.cache.get(page)
+        if slot is not None:
+            self.cache_hit += 1
+            self.ref[slot] = 1
+            return
+        if len(self.cache) < self.cache_slots:
+            slot = len(self.cache)
+        else:
+            # 참조 비트가 0인 슬롯을 만날 때까지 바늘을 돌리며 비트를 지운다
+            ref = self.ref
+            while ref[self.hand]:
+                ref[self.hand] = 0
+                self.hand = (self.hand + 1) % self.cache_slots
+            slot = self.hand
+            self.hand = (self.hand + 1) % self.cache_slots
+            del self.cache[self.pages[slot]]
+        self.pages[slot] = page
+        self.ref[slot] = 1
+        self.cache[page] = slot
+
+
+class LFU(Policy):
+    # 빈도별 버킷(OrderedDict)으로 O(1) 승격/축출, 같은 빈도에서는 LRU 순서로 축출
+    name = "LFU"
+
+    def __init__(self, cache_slots):
+        super().__init__(cache_slots)
+        self.freq = {}  # page -> 빈도
+        self.buckets = {}  # 빈도 -> OrderedDict(page)
+        self.min_freq = 0
+
+    def __len__(self):
+        return len(self.freq)
+
+    def do_sim(self, page):
+        self.tot_cnt += 1
+        f = self.freq.get(page)
+        if f is not None:
+            self.cache_hit += 1
+            bucket = self.buckets[f]
+            del bucket[page]
+            if not bucket:
+                del self.buckets[f]
+                if self.min_freq == f:
+                    self.min_freq = f + 1
+            self.freq[page] = f + 1
+            self.buckets.setdefault(f + 1, OrderedDict())[page] = None
+            return
+        if len(self.freq) >= self.cache_slots:
+            bucket = self.buckets[self.min_freq]
+            victim, _ = bucket.popitem(last=False)
+            if not bucket:
+                del self.buckets[self.min_freq]
+            del self.freq[victim]
+        self.freq[page] = 1
+        self.buckets.setdefault(1, OrderedDict())[page] = None
+        self.min_freq = 1
+
+
+class ARC(Policy):
+    # Megiddo & Modha 의 Adaptive Replacement Cache
+    name = "ARC"
+
+    def __init__(self, cache_slots):
+        super().__init__(cache_slots)
+        self.p = 0
+        self.t1 = OrderedDict()
+        self.t2 = OrderedDict()
+        self.b1 = OrderedDict()
+        self.b2 = OrderedDict()
+
+    def _replace(self, in_b2):
+        t1_len = len(self.t1)
+        if t1_len and (t1_len > self.p or (in_b2 and t1_len == self.p) or not self.t2):
+            victim, _ = self.t1.popitem(last=False)
+            self.b1[victim] = None
+        else:
+            victim, _ = self.t2.popitem(last=False)
+            self.b2[victim] = None
+
+    def __len__(self):
+        return len(self.t1) + len(self.t2)
+
+    def do_sim(self, page):
+        self.tot_cnt += 1
+        c = self.cache_slots
+        t1, t2, b1, b2 = self.t1, self.t2, self.b1, self.b2
+        if page in t1:
+            self.cache_hit += 1
+            del t1[page]
+            t2[page] = None
+        elif page in t2:
+            self.cache_hit += 1
+            t2.move_to_end(page)
+        elif page in b1:
+            self.p = min(c, self.p + max(len(b2) // len(b1), 1))
+            self._replace(False)
+            del b1[page]
+            t2[page] = None
+        elif page in b2:
+            self.p = max(0, self.p - max(len(b1) // len(b2), 1))
+            self._replace(True)
+            del b2[page]
+            t2[page] = None
+        else:
+            l1 = len(t1) + len(b1)
+            total = l1 + len(t2) + len(b2)
+            if l1 == c:
+                if len(t1) < c:
+                    b1.popitem(last=False)
+                    self._replace(False)
+                else:
+                    t1.popitem(last=False)
+            elif total >= c:
+                if total == 2 * c:
+                    b2.popitem(last=False)
+                self._replace(False)
+            t1[page] = None
+
+
+class TwoQ(Policy):
+    # Johnson & Shasha 의 full 2Q: A1in(FIFO) / A1out(유령) / Am(LRU)
+    name = "2Q"
+
+    def __init__(self, cache_slots):
+        super().__init__(cache_slots)
+        self.kin = max(1, cache_slots // 4)
+        self.kout = max(1, cache_slots // 2)
+        self.a1in = OrderedDict()
+        self.a1out = OrderedDict()
+        self.am = OrderedDict()
+
+    def _reclaim(self):
+        if len(self.a1in) + len(self.am) < self.cache_slots:
+            return
+        if len(self.a1in) > self.kin or not self.am:
+            victim, _ = self.a1in.popitem(last=False)
+            self.a1out[victim] = None
+            if len(self.a1out) > self.kout:
+                self.a1out.popitem(last=False)
+        else:
+            self.am.popitem(last=False)
+
+    def __len__(self):
+        return len(self.a1in) + len(self.am)
+
+    def do_sim(self, page):
+        self.tot_cnt += 1
+        if page in self.am:
+            self.cache_hit += 1
+            self.am.move_to_end(page)
+        elif page in self.a1in:
+            self.cache_hit += 1
+        elif page in self.a1out:
+            del self.a1out[page]
+            self._reclaim()
+            self.am[page] = None
+        else:
+            self._reclaim()
+            self.a1in[page] = None
+
+
+class LIRS(Policy):
+    # Jiang & Zhang 의 LIRS. stack 은 최근성 스택 S(마지막이 top), queue 는 상주 HIR 블록 Q
+    name = "LIRS"
+
+    def __init__(self, cache_slots):
+        super().__init__(cache_slots)
+        hir_slots = max(1, cache_slots // 100)
+        self.lir_slots = cache_slots - hir_slots
+        self.lir = set()
+        self.stack = OrderedDict()
+        self.queue = OrderedDict()
+
+    def _prune(self):
+        stack = self.stack
+        while stack:
+            bottom = next(iter(stack))
+            if bottom in self.lir:
+                break
+            del stack[bottom]
+
+    def _demote_bottom(self):
+        # 스택 바닥의 LIR 블록을 상주 HIR 로 내리고 Q 끝에 넣는다
+        self._prune()
+        bottom, _ = self.stack.popitem(last=False)
+        self.lir.remove(bottom)
+        self.queue[bottom] = None
+        self._prune()
+
+    def __len__(self):
+        return len(self.lir) + len(self.queue)
+
+    def do_sim(self, page):
+        self.tot_cnt += 1
+        stack, queue, lir = self.stack, self.queue, self.lir
+        if page in lir:
+            self.cache_hit += 1
+            was_bottom = next(iter(stack)) == page
+            stack.move_to_end(page)
+            if was_bottom:
+                self._prune()
+            return
+        if page in queue:
+            self.cache_hit += 1
+            if page in stack:
+                del queue[page]
+                stack.move_to_end(page)
+                lir.add(page)
+                self._demote_bottom()
+            else:
+                stack[page] = None
+                queue.move_to_end(page)
+            return
+        if len(lir) + len(queue) >= self.cache_slots:
+            queue.popitem(last=False)  # 스택에 남아 있으면 비상주 HIR 이 된다
+        if len(lir) < self.lir_slots:
+            stack[page] = None
+            stack.move_to_end(page)
+            lir.add(page)
+        elif page in stack:
+            stack.move_to_end(page)
+            lir.add(page)
+            self._demote_bottom()
+        else:
+            stack[page] = None
+            queue[page] = None
+
+
+def next_use_times(trace):
+    # t 번째 접근한 페이지가 다음에 다시 쓰이는 시점 (없으면 len(trace)), OPT 들이 함께 쓴다
+    never = len(trace)
+    next_use = array('q', bytes(8 * never))
+    last = {}
+    for t in range(never - 1, -1, -1):
+        page = trace[t]
+        next_use[t] = last.get(page, never)
+        last[page] = t
+    return next_use
+
+
+class OPT(Policy):
+    # Bélády 의 최적 교체: 다음 사용 시점이 가장 먼 페이지를 축출 (상한 비교용, 전체 트레이스 필요)
+    name = "OPT"
+
+    def __init__(self, cache_slots, next_use):
+        super().__init__(cache_slots)
+        self.next_use = next_use  # next_use_times(trace), 크기가 다른 OPT 끼리 공유
+        self.cache = {}  # page -> 다음 사용 시점
+        self.heap = []  # (-다음 사용 시점, page), 지연 무효화
+
+    def __len__(self):
+        return len(self.cache)
+
+    def do_sim(self, page):
+        t = self.tot_cnt
+        self.tot_cnt += 1
+        nxt = self.next_use[t]
+        if page in self.cache:
+            self.cache_hit += 1
+        elif len(self.cache) >= self.cache_slots:
+            while True:
+                neg, victim = heapq.heappop(self.heap)
+                if self.cache.get(victim) == -neg:
+                    del self.cache[victim]
+                    break
+        self.cache[page] = nxt
+        heapq.heappush(self.heap, (-nxt, page))
+        if len(self.heap) > 2 * len(self.cache) + 64:
+            # 무효 항목이 너무 많아지면 힙을 다시 만든다
+            self.heap = [(-n, p) for p, n in self.cache.items()]
+            heapq.heapify(self.heap)
+
+
+POLICIES = {cls.name: cls for cls in (LRU, FIFO, CLOCK, LFU, ARC, TwoQ, LIRS, OPT)}
+
+
+def make_policy(name, cache_slots, trace=None, next_use=None):
+    # OPT 여러 개를 만들 때는 next_use_times(trace) 를 한 번 계산해 넘긴다
+    if name == "OPT":
+        return OPT(cache_slots, next_use if next_use is not None else next_use_times(trace))
+    return POLICIES[name](cache_slots)
+
+
+def run_policies(trace, names, sizes):
+    # 트레이스를 한 번만 훑으면서 (정책, 크기) 조합을 모두 시뮬레이션
+    next_use = next_use_times(trace) if "OPT" in names else None
+    sims = [make_policy(name, cache_slots, trace, next_use) for name in names for cache_slots in sizes]
+    for page in trace:
+        for sim in sims:
+            sim.do_sim(page)
+    return sims
+
+
+if __name__ == "__main__":
+    names = sys.argv[1:] or list(POLICIES)
+    trace, _ = load_pages_cached("./linkbench.trc")
+    for sim in run_policies(trace, names, range(100, 1001, 100)):
+        sim.print_status()
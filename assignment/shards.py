@@ -0,0 +1,110 @@
+import heapq
+import math
+import sys
+
+from stack_distance import StackDistanceSimulator, hit_ratio_curve
+from trace_io import load_pages_cached
+
+MODULUS = 1 << 24  # 해시 공간 P, 페이지는 hash(page) mod P < T 일 때 샘플된다
+_MASK = (1 << 64) - 1
+
+
+def page_hash(page):
+    # splitmix64 로 섞어서 연속된 페이지 번호도 고르게 샘플되게 한다
+    x = (page if isinstance(page, int) else hash(page)) & _MASK
+    x = (x + 0x9E3779B97F4A7C15) & _MASK
+    x = ((x ^ (x >> 30)) * 0xBF58476D1CE4E5B9) & _MASK
+    x = ((x ^ (x >> 27)) * 0x94D049BB133111EB) & _MASK
+    return (x ^ (x >> 31)) % MODULUS
+
+
+class ShardsSimulator:
+    """
+    SHARDS(공간 해시 샘플링) 기반 근사 LRU miss ratio curve.
+    rate 비율의 페이지만 스택 거리로 시뮬레이션하고 거리를 1/rate 배로 늘린다.
+    max_pages 를 주면 추적 페이지 수를 고정하고, 넘칠 때마다 임계값 T 를 낮춘다(SHARDS fixed-size).
+    """
+    def __init__(self, rate=0.01, max_pages=None):
+        self.threshold = max(1, int(rate * MODULUS))
+        self.max_pages = max_pages
+        self.stack = StackDistanceSimulator(capacity=1 << 12)
+        self.hashes = []  # 추적 페이지의 (-hash, page) 최대 힙
+        self.histogram = {}  # 배율 적용된 거리 -> 가중치 합
+        self.sampled = 0  # 샘플된 참조 수
+        self.weight = 0.0  # 샘플 참조의 가중치 합 (전체 참조 수 추정치)
+        self.tot_cnt = 0
+
+    @property
+    def rate(self):
+        return self.threshold / MODULUS
+
+    def _shrink(self):
+        # 해시가 가장 큰 페이지들을 빼서 추적 페이지 수를 max_pages 로 맞춘다
+        while len(self.stack.last_access) > self.max_pages:
+            neg, page = heapq.heappop(self.hashes)
+            self.threshold = -neg
+            self.stack.forget(page)
+            while self.hashes and -self.hashes[0][0] >= self.threshold:
+                self.stack.forget(heapq.heappop(self.hashes)[1])
+
+    def do_sim(self, page):
+        self.tot_cnt += 1
+        h = page_hash(page)
+        if h >= self.threshold:
+            return
+        rate = self.rate
+        self.sampled += 1
+        self.weight += 1 / rate
+        new_page = page not in self.stack.last_access
+        distance = self.stack.access(page)
+        if distance is not None:
+            scaled = math.ceil(distance / rate)
+            self.histogram[scaled] = self.histogram.get(scaled, 0.0) + 1 / rate
+        if new_page and self.max_pages is not None:
+            heapq.heappush(self.hashes, (-h, page))
+            if len(self.stack.last_access) > self.max_pages:
+                self._shrink()
+
+    def miss_ratio_curve(self, sizes, adjust=True):
+        """
+        각 크기의 (miss ratio, 95% 오차 한계) 목록을 반환합니다.
+        adjust 가 켜져 있으면 샘플 가중치 합과 실제 참조 수의 차이를
+        거리 0 구간에 더하는 SHARDS_adj 보정을 적용합니다.
+        오차 한계는 샘플 참조를 독립 시행으로 본 이항 근사값입니다.
+        """
+        if self.sampled == 0:
+            return [(1.0, 1.0) for _ in sizes]
+        total = self.tot_cnt if adjust else self.weight
+        base = (self.tot_cnt - self.weight) if adjust else 0.0
+        distances = sorted(self.histogram)
+        result = []
+        for cache_slots in sizes:
+            hits = base + sum(self.histogram[d] for d in distances if d <= cache_slots)
+            miss = min(1.0, max(0.0, 1 - hits / total))
+            bound = 1.96 * math.sqrt(miss * (1 - miss) / self.sampled)
+            result.append((miss, bound))
+        return result
+
+
+def compare_with_exact(pages, sizes, rate=0.01, max_pages=None):
+    # 근사 MRC 와 정확한 스택 거리 MRC 를 같은 트레이스에서 비교
+    sim = ShardsSimulator(rate, max_pages)
+    for page in pages:
+        sim.do_sim(page)
+    approx = sim.miss_ratio_curve(sizes)
+    exact = [1 - hit for hit in hit_ratio_curve(pages, sizes)]
+    return sim, approx, exact
+
+
+if __name__ == "__main__":
+    # python shards.py [rate] [max_pages]
+    rate = float(sys.argv[1]) if len(sys.argv) > 1 else 0.1
+    max_pages = int(sys.argv[2]) if len(sys.argv) > 2 else None
+    sizes = list(range(100, 1001, 100))
+    pages, _ = load_pages_cached("./linkbench.trc")
+    sim, approx, exact = compare_with_exact(pages, sizes, rate, max_pages)
+    errors = []
+    for cache_slots, (miss, bound), exact_miss in zip(sizes, approx, exact):
+        errors.append(abs(miss - exact_miss))
+        print("cache_slot =", cache_slots, "miss ratio = {:.4f} +- {:.4f}".format(miss, bound), "exact = {:.4f}".format(exact_miss))
+    print("final rate = {:.5f} sampled = {} mean abs error = {:.4f}".format(sim.rate, sim.sampled, sum(errors) / len(errors)))
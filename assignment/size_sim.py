@@ -0,0 +1,150 @@
+import heapq
+import sys
+from collections import OrderedDict
+
+from trace_io import load_sized_pages_cached
+
+
+class SizePolicy:
+    # 바이트 용량 기반 캐시의 공통 인터페이스: do_sim(page, size) / print_status()
+    # 용량보다 큰 객체는 캐시에 넣지 않고 그대로 통과시킨다.
+    name = None
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.used = 0
+        self.cache_hit = 0
+        self.byte_hit = 0
+        self.tot_cnt = 0
+        self.tot_bytes = 0
+
+    def do_sim(self, page, size):
+        self.tot_cnt += 1
+        self.tot_bytes += size
+        if self._lookup(page, size):
+            self.cache_hit += 1
+            self.byte_hit += size
+        elif self._admit(size):
+            while self.used + size > self.capacity:
+                self.used -= self._evict()
+            self._insert(page, size)
+            self.used += size
+
+    def _admit(self, size):
+        return size <= self.capacity
+
+    def _resize(self, old_size, size):
+        # 적중한 객체의 크기가 바뀌었으면 사용량을 고치고 넘친 만큼 축출
+        self.used += size - old_size
+        while self.used > self.capacity:
+            self.used -= self._evict()
+
+    def print_status(self):
+        print("policy =", self.name, "capacity =", self.capacity, "cache_hit =", self.cache_hit,
+              "hit ratio =", self.cache_hit / self.tot_cnt, "byte hit ratio =", self.byte_hit / self.tot_bytes)
+
+
+class SizeLRU(SizePolicy):
+    name = "LRU"
+
+    def __init__(self, capacity):
+        super().__init__(capacity)
+        self.cache = OrderedDict()  # page -> size, 마지막이 MRU
+
+    def _lookup(self, page, size):
+        old_size = self.cache.get(page)
+        if old_size is None:
+            return False
+        self.cache.move_to_end(page)
+        if old_size != size:
+            self.cache[page] = size
+            self._resize(old_size, size)
+        return True
+
+    def _evict(self):
+        _, size = self.cache.popitem(last=False)
+        return size
+
+    def _insert(self, page, size):
+        self.cache[page] = size
+
+
+class SizeThresholdLRU(SizeLRU):
+    # threshold 바이트보다 큰 객체는 캐시에 들이지 않는 LRU
+    name = "LRU-threshold"
+
+    def __init__(self, capacity, threshold):
+        super().__init__(capacity)
+        self.threshold = threshold
+
+    def _admit(self, size):
+        return size <= self.threshold and size <= self.capacity
+
+
+class GDSF(SizePolicy):
+    # Greedy-Dual-Size-Frequency: 우선순위 H = L + freq / size, H 가 가장 작은 객체를 축출하고 L 을 올린다
+    # 힙 항목은 지연 무효화하며 접근당 O(log n)
+    name = "GDSF"
+
+    def __init__(self, capacity):
+        super().__init__(capacity)
+        self.clock = 0.0  # L
+        self.cache = {}  # page -> [priority, freq, size]
+        self.heap = []  # (priority, seq, page)
+        self.seq = 0
+
+    def _push(self, page, entry):
+        # 크기 0 객체는 우선순위 계산에서만 1 바이트로 본다 (used 에는 실제 크기만 더하고 뺀다)
+        entry[0] = self.clock + entry[1] / max(entry[2], 1)
+        self.seq += 1
+        heapq.heappush(self.heap, (entry[0], self.seq, page))
+        if len(self.heap) > 2 * len(self.cache) + 64:
+            # 무효 항목이 너무 많아지면 힙을 다시 만든다
+            self.heap = [(e[0], i, p) for i, (p, e) in enumerate(self.cache.items())]
+            heapq.heapify(self.heap)
+
+    def _lookup(self, page, size):
+        entry = self.cache.get(page)
+        if entry is None:
+            return False
+        entry[1] += 1
+        old_size = entry[2]
+        entry[2] = size
+        self._push(page, entry)
+        if old_size != size:
+            self._resize(old_size, size)
+        return True
+
+    def _evict(self):
+        while True:
+            priority, _, page = heapq.heappop(self.heap)
+            entry = self.cache.get(page)
+            if entry is not None and entry[0] == priority:
+                break
+        self.clock = priority
+        del self.cache[page]
+        return entry[2]
+
+    def _insert(self, page, size):
+        entry = [0.0, 1, size]
+        self.cache[page] = entry
+        self._push(page, entry)
+
+
+def run_size_policies(pages, sizes, policies):
+    # 트레이스를 한 번만 훑으며 모든 정책을 함께 시뮬레이션
+    for page, size in zip(pages, sizes):
+        for sim in policies:
+            sim.do_sim(page, size)
+    return policies
+
+
+if __name__ == "__main__":
+    # python size_sim.py [size_column]  (기본: 세 번째 열이 객체 크기)
+    size_column = int(sys.argv[1]) if len(sys.argv) > 1 else 2
+    pages, sizes, _ = load_sized_pages_cached("./linkbench.trc", size_column)
+    policies = []
+    for capacity in range(1 << 20, (10 << 20) + 1, 1 << 20):
+        policies += [SizeLRU(capacity), SizeThresholdLRU(capacity, capacity // 64), GDSF(capacity)]
+    for sim in run_size_policies(pages, sizes, policies):
+        sim.print_status()
@@ -0,0 +1,115 @@
+from trace_io import load_pages_cached
+
+class FenwickTree:
+    def __init__(self, size):
+        self.size = size
+        self.tree = [0] * (size + 1)
+
+    def add(self, pos, delta):
+        pos += 1
+        while pos <= self.size:
+            self.tree[pos] += delta
+            pos += pos & -pos
+
+    def prefix_sum(self, pos):
+        # [0, pos) 구간의 합
+        total = 0
+        while pos > 0:
+            total += self.tree[pos]
+            pos -= pos & -pos
+        return total
+
+
+class StackDistanceSimulator:
+    """
+    Mattson 스택 거리 기반 LRU 시뮬레이터.
+    트레이스를 한 번만 읽고 재사용 거리 히스토그램을 만들어 두면
+    모든 cache_slots 에 대한 LRU 적중 수를 한 번에 구할 수 있다.
+    """
+    def __init__(self, capacity=1 << 16):
+        self.clock = 0
+        self.last_access = {}
+        self.marks = FenwickTree(capacity)
+        self.histogram = {}  # 스택 거리 -> 횟수 (거리 1 = MRU)
+        self.cold_miss = 0
+        self.tot_cnt = 0
+
+    def _compact(self):
+        # 시간축이 가득 차면 살아있는 마지막 접근 시점들을 순서대로 0..k-1 로 다시 매긴다.
+        # 살아있는 페이지가 절반 이상이면 시간축을 두 배로 늘린다.
+        live = sorted(self.last_access, key=self.last_access.get)
+        size = self.marks.size
+        if 2 * len(live) >= size:
+            size *= 2
+        marks = FenwickTree(size)
+        for t, page in enumerate(live):
+            self.last_access[page] = t
+            marks.add(t, 1)
+        self.marks = marks
+        self.clock = len(live)
+
+    def access(self, page):
+        # page 를 접근하고 스택 거리를 반환 (처음 보는 페이지면 None)
+        if self.clock >= self.marks.size:
+            self._compact()
+        prev = self.last_access.get(page)
+        distance = None
+        if prev is not None:
+            # prev 이후에 접근된 서로 다른 페이지 수 + 1 이 스택 거리
+            distance = self.marks.prefix_sum(self.clock) - self.marks.prefix_sum(prev + 1) + 1
+            self.marks.add(prev, -1)
+        self.marks.add(self.clock, 1)
+        self.last_access[page] = self.clock
+        self.clock += 1
+        return distance
+
+    def forget(self, page):
+        # 추적 중인 페이지를 스택에서 뺀다 (샘플링에서 제외될 때 사용)
+        prev = self.last_access.pop(page, None)
+        if prev is not None:
+            self.marks.add(prev, -1)
+
+    def do_sim(self, page):
+        self.tot_cnt += 1
+        distance = self.access(page)
+        if distance is None:
+            self.cold_miss += 1
+        else:
+            self.histogram[distance] = self.histogram.get(distance, 0) + 1
+
+    def hit_counts(self, sizes):
+        # 크기 순으로 히스토그램 누적합을 훑어 각 크기의 적중 수를 계산
+        distances = sorted(self.histogram)
+        order = sorted(range(len(sizes)), key=lambda i: sizes[i])
+        result = [0] * len(sizes)
+        hits = 0
+        j = 0
+        for i in order:
+            while j < len(distances) and distances[j] <= sizes[i]:
+                hits += self.histogram[distances[j]]
+                j += 1
+            result[i] = hits
+        return result
+
+    def hit_ratio_curve(self, sizes):
+        if self.tot_cnt == 0:
+            return [0.0] * len(sizes)
+        return [hits / self.tot_cnt for hits in self.hit_counts(sizes)]
+
+
+def hit_ratio_curve(trace, sizes):
+    sizes = list(sizes)
+    sim = StackDistanceSimulator()
+    for page in trace:
+        sim.do_sim(page)
+    return sim.hit_ratio_curve(sizes)
+
+
+if __name__ == "__main__":
+    sizes = list(range(100, 1001, 100))
+    sim = StackDistanceSimulator()
+    pages, _ = load_pages_cached("./linkbench.trc")
+    for page in pages:
+        sim.do_sim(page)
+    for cache_slots, cache_hit in zip(sizes, sim.hit_counts(sizes)):
+        print("cache_slot =", cache_slots, "cache_hit =", cache_hit, "hit ratio =", cache_hit / sim.tot_cnt)
@@ -0,0 +1,73 @@
+import os
+import sys
+from array import array
+from multiprocessing import Pool, shared_memory
+
+from policies import POLICIES, make_policy, next_use_times
+from trace_io import load_pages_cached
+
+_shm = None
+_trace = None
+_next_use = None
+
+
+def _attach(name, count, with_next_use):
+    # 작업 프로세스는 공유 메모리의 트레이스를 복사 없이 그대로 읽는다
+    # with_next_use 면 트레이스 뒤에 OPT 용 next_use 배열이 이어서 들어 있다
+    global _shm, _trace, _next_use
+    _shm = shared_memory.SharedMemory(name=name)
+    _trace = _shm.buf[:8 * count].cast('q')
+    if with_next_use:
+        _next_use = _shm.buf[8 * count:16 * count].cast('q')
+
+
+def _simulate(job):
+    name, cache_slots = job
+    sim = make_policy(name, cache_slots, _trace, _next_use)
+    do_sim = sim.do_sim
+    for page in _trace:
+        do_sim(page)
+    return name, cache_slots, sim.cache_hit, sim.tot_cnt
+
+
+def sweep(pages, names, sizes, workers=None):
+    # (정책, 크기) 격자를 프로세스 풀에 나눠 실행하고 결과를 한 표로 모은다
+    if not isinstance(pages, array):
+        pages = array('q', pages)
+    count = len(pages)
+    # OPT 의 next_use 는 여기서 한 번만 계산해 모든 작업이 공유한다
+    with_next_use = "OPT" in names
+    shm = shared_memory.SharedMemory(create=True, size=max(8 * count * (2 if with_next_use else 1), 1))
+    try:
+        shm.buf[:8 * count] = pages.tobytes()
+        if with_next_use:
+            shm.buf[8 * count:16 * count] = next_use_times(pages).tobytes()
+        jobs = [(name, cache_slots) for name in names for cache_slots in sizes]
+        with Pool(workers or os.cpu_count(), initializer=_attach,
+                  initargs=(shm.name, count, with_next_use)) as pool:
+            return pool.map(_simulate, jobs, chunksize=1)
+    finally:
+        shm.close()
+        shm.unlink()
+
+
+if __name__ == "__main__":
+    # python sweep.py [정책 ...] [--sizes start:stop:step] [--workers N]
+    args = sys.argv[1:]
+    sizes = range(100, 1001, 100)
+    workers = None
+    names = []
+    i = 0
+    while i < len(args):
+        if args[i] == "--sizes":
+            sizes = range(*map(int, args[i + 1].split(":")))
+            i += 2
+        elif args[i] == "--workers":
+            workers = int(args[i + 1])
+            i += 2
+        else:
+            names.append(args[i])
+            i += 1
+    pages, _ = load_pages_cached("./linkbench.trc")
+    for name, cache_slots, cache_hit, tot_cnt in sweep(pages, names or list(POLICIES), sizes, workers):
+        print("policy =", name, "cache_slot =", cache_slots, "cache_hit =", cache_hit, "hit ratio =", cache_hit / tot_cnt)
@@ -0,0 +1,112 @@
+import csv
+import json
+import sys
+
+from policies import POLICIES, make_policy
+from trace_io import load_pages_cached
+
+
+class CSVSink:
+    FIELDS = ["window", "start", "end", "hits", "misses", "evictions", "working_set", "occupancy", "hit_ratio"]
+
+    def __init__(self, path):
+        self.file = open(path, "w", newline="")
+        self.writer = csv.DictWriter(self.file, fieldnames=self.FIELDS)
+        self.writer.writeheader()
+
+    def __call__(self, row):
+        self.writer.writerow(row)
+
+    def close(self):
+        self.file.close()
+
+
+class JSONSink:
+    # 한 줄에 윈도우 하나씩 JSON Lines 로 기록
+    def __init__(self, path):
+        self.file = open(path, "w")
+
+    def __call__(self, row):
+        self.file.write(json.dumps(row) + "\n")
+
+    def close(self):
+        self.file.close()
+
+
+def run_windowed(sim, pages, window=10000, warmup=0, times=None, bucket=None, sink=None):
+    """
+    시뮬레이터를 돌리며 윈도우별 통계(적중, 미스, 축출, working set, 점유 슬롯)를 모읍니다.
+    - window : 접근 수 기준 윈도우 크기
+    - times, bucket : 주어지면 접근 시각을 bucket 폭으로 잘라 윈도우를 나눕니다
+    - warmup : 앞쪽 접근 수. 시뮬레이션은 하지만 통계에서는 제외합니다
+    - sink : 윈도우가 끝날 때마다 row(dict) 를 받는 호출 가능 객체
+    윈도우 통계가 필요 없으면 평소처럼 do_sim 만 부르면 되고, 추가 비용은 없습니다.
+    반환값은 (윈도우 목록, warm-up 이후 적중률) 입니다.
+    """
+    rows = []
+    do_sim = sim.do_sim
+    n = len(pages)
+    for page in pages[:warmup]:
+        do_sim(page)
+    base_hit = sim.cache_hit
+    base_cnt = sim.tot_cnt
+    start = min(warmup, n)
+    while start < n:
+        if times is not None:
+            limit = (times[start] // bucket + 1) * bucket
+            end = start
+            while end < n and times[end] < limit:
+                end += 1
+        else:
+            end = min(start + window, n)
+        hits = sim.cache_hit
+        occupancy = len(sim)
+        seen = set()
+        for page in pages[start:end]:
+            do_sim(page)
+            seen.add(page)
+        hits = sim.cache_hit - hits
+        misses = end - start - hits
+        # 미스로 들어온 페이지 중 점유 슬롯을 늘리지 못한 만큼이 축출된 수
+        evictions = misses - (len(sim) - occupancy)
+        row = {
+            "window": len(rows),
+            "start": start,
+            "end": end,
+            "hits": hits,
+            "misses": misses,
+            "evictions": evictions,
+            "working_set": len(seen),
+            "occupancy": len(sim),
+            "hit_ratio": hits / (end - start),
+        }
+        rows.append(row)
+        if sink is not None:
+            sink(row)
+        start = end
+    counted = sim.tot_cnt - base_cnt
+    steady = (sim.cache_hit - base_hit) / counted if counted else 0.0
+    return rows, steady
+
+
+if __name__ == "__main__":
+    # python telemetry.py POLICY cache_slots [--window N] [--warmup N] [--csv out.csv | --json out.json]
+    args = sys.argv[1:]
+    if len(args) < 2 or args[0] not in POLICIES:
+        print("usage: python telemetry.py {} cache_slots [--window N] [--warmup N] [--csv out | --json out]".format("|".join(POLICIES)))
+        sys.exit(1)
+    opts = dict(zip(args[2::2], args[3::2]))
+    pages, _ = load_pages_cached("./linkbench.trc")
+    sim = make_policy(args[0], int(args[1]), pages)
+    sink = None
+    if "--csv" in opts:
+        sink = CSVSink(opts["--csv"])
+    elif "--json" in opts:
+        sink = JSONSink(opts["--json"])
+    rows, steady = run_windowed(sim, pages, int(opts.get("--window", 10000)), int(opts.get("--warmup", 0)), sink=sink)
+    if sink is not None:
+        sink.close()
+    else:
+        for row in rows:
+            print(row)
+    print("policy =", sim.name, "cache_slot =", sim.cache_slots, "steady-state hit ratio =", steady)
@@ -0,0 +1,275 @@
+import mmap
+import os
+import re
+import struct
+import sys
+from array import array
+
+CHUNK_BYTES = 1 << 26  # 한 번에 파싱할 바이트 수 (64MB)
+
+# 바이너리 트레이스: 헤더 뒤에 int64 페이지 ID 배열(또는 delta+varint), 그 뒤에 intern 이름들
+MAGIC = b"PTRC"
+VERSION = 1
+FLAG_VARINT = 1
+# magic, version, flags, reserved, count, 원본 크기, 원본 mtime_ns, intern 이름 수
+HEADER = struct.Struct("<4sBBHQQqQ")
+
+
+class InternTable:
+    # 숫자가 아닌 페이지 ID 는 음수 정수(-1, -2, ...)로 바꿔 저장한다.
+    # 숫자 페이지 ID 는 음수가 아니라고 가정한다.
+    def __init__(self):
+        self.ids = {}
+        self.names = []
+
+    def intern(self, token):
+        page_id = self.ids.get(token)
+        if page_id is None:
+            self.names.append(token)
+            page_id = -len(self.names)
+            self.ids[token] = page_id
+        return page_id
+
+    def name(self, page_id):
+        if page_id < 0:
+            return self.names[-page_id - 1].decode()
+        return str(page_id)
+
+
+def _column_pattern(column):
+    return re.compile(rb"(?m)^[ \t]*" + rb"(?:\S+[ \t]+)" * column + rb"(\S+)")
+
+
+def _parse_tokens(tokens, intern):
+    try:
+        return array('q', map(int, tokens))
+    except ValueError:
+        pages = array('q')
+        for token in tokens:
+            try:
+                pages.append(int(token))
+            except ValueError:
+                pages.append(intern.intern(token))
+        return pages
+
+
+def _sized_pattern(size_column):
+    # 첫 열(페이지)과 size_column 열(크기). 크기 열이 없는 줄은 크기가 b"" 로 잡힌다
+    return re.compile(rb"(?m)^[ \t]*(\S+)(?:(?:[ \t]+\S+){%d}[ \t]+(\S+))?" % (size_column - 1))
+
+
+def _iter_blocks(path, chunk_bytes=CHUNK_BYTES):
+    # 파일을 mmap 하고 줄 경계에서 자른 덩어리(bytes)를 차례로 내보낸다
+    with open(path, "rb") as data_file:
+        try:
+            mm = mmap.mmap(data_file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # 빈 파일
+            return
+        with mm:
+            start = 0
+            size = len(mm)
+            while start < size:
+                end = min(start + chunk_bytes, size)
+                if end < size:
+                    cut = mm.rfind(b"\n", start, end)
+                    if cut < 0:
+                        cut = mm.find(b"\n", end)
+                    end = size if cut < 0 else cut + 1
+                yield mm[start:end]
+                start = end
+
+
+def iter_chunks(path, column=0, intern=None, chunk_bytes=CHUNK_BYTES):
+    # 줄 단위로 잘린 덩어리마다 column 열을 array('q') 로 내보낸다
+    if intern is None:
+        intern = InternTable()
+    pattern = _column_pattern(column)
+    for block in _iter_blocks(path, chunk_bytes):
+        yield _parse_tokens(pattern.findall(block), intern)
+
+
+def iter_pages(path, column=0, intern=None, chunk_bytes=CHUNK_BYTES):
+    for chunk in iter_chunks(path, column, intern, chunk_bytes):
+        yield from chunk
+
+
+def load_pages(path, column=0, intern=None, chunk_bytes=CHUNK_BYTES):
+    # 트레이스 전체를 접근당 8바이트의 array('q') 로 읽는다 (memoryview 로 버퍼 공유 가능)
+    pages = array('q')
+    for chunk in iter_chunks(path, column, intern, chunk_bytes):
+        pages.extend(chunk)
+    return pages
+
+
+def load_sized_pages(path, size_column=2, intern=None, chunk_bytes=CHUNK_BYTES):
+    # 페이지와 크기를 한 번에 읽어 줄마다 짝이 맞는 (pages, sizes) 를 반환
+    # 크기는 정수로만 읽고, 크기 열이 없거나 숫자가 아닌 줄이 있으면 ValueError
+    if size_column < 1:
+        raise ValueError("size column must come after the page column")
+    if intern is None:
+        intern = InternTable()
+    pattern = _sized_pattern(size_column)
+    pages = array('q')
+    sizes = array('q')
+    for block in _iter_blocks(path, chunk_bytes):
+        rows = pattern.findall(block)
+        tokens = [size for _, size in rows]
+        try:
+            sizes.extend(array('q', map(int, tokens)))
+        except ValueError:
+            for (page, _), token in zip(rows, tokens):
+                try:
+                    int(token)
+                except ValueError:
+                    raise ValueError("bad size column for page {!r}: {!r}".format(
+                        page.decode(), token.decode())) from None
+        pages.extend(_parse_tokens([page for page, _ in rows], intern))
+    return pages, sizes
+
+
+def encode_deltas(values):
+    # 이전 값과의 차이를 zigzag 변환 후 LEB128 varint 로 기록
+    out = bytearray()
+    prev = 0
+    for value in values:
+        delta = value - prev
+        prev = value
+        z = delta << 1 if delta >= 0 else ((-delta) << 1) - 1
+        while z >= 0x80:
+            out.append((z & 0x7F) | 0x80)
+            z >>= 7
+        out.append(z)
+    return out
+
+
+def decode_deltas(buf, count):
+    values = array('q', bytes(8 * count))
+    prev = 0
+    pos = 0
+    for i in range(count):
+        z = 0
+        shift = 0
+        while True:
+            byte = buf[pos]
+            pos += 1
+            z |= (byte & 0x7F) << shift
+            if byte < 0x80:
+                break
+            shift += 7
+        prev += (z >> 1) if not z & 1 else -((z + 1) >> 1)
+        values[i] = prev
+    return values, pos
+
+
+def binary_path(path, column=0):
+    if column == 0:
+        return path + ".ptrc"
+    return "{}.{}.ptrc".format(path, column)
+
+
+def write_binary(path, pages, intern=None, compress=False, source=None):
+    names = intern.names if intern is not None else []
+    src_size, src_mtime = 0, 0
+    if source is not None:
+        st = os.stat(source)
+        src_size, src_mtime = st.st_size, st.st_mtime_ns
+    flags = FLAG_VARINT if compress else 0
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as out:
+        out.write(HEADER.pack(MAGIC, VERSION, flags, 0, len(pages), src_size, src_mtime, len(names)))
+        if compress:
+            out.write(encode_deltas(pages))
+        else:
+            out.write(pages.tobytes() if isinstance(pages, array) else array('q', pages).tobytes())
+        for name in names:
+            out.write(name + b"\n")
+    os.replace(tmp_path, path)
+
+
+def read_header(path):
+    with open(path, "rb") as data_file:
+        header = data_file.read(HEADER.size)
+    if len(header) < HEADER.size:
+        return None
+    fields = HEADER.unpack(header)
+    if fields[0] != MAGIC or fields[1] != VERSION:
+        return None
+    return fields
+
+
+def load_binary(path):
+    # 압축하지 않은 파일은 mmap 위의 memoryview 를 그대로 돌려준다 (복사 없음)
+    with open(path, "rb") as data_file:
+        mm = mmap.mmap(data_file.fileno(), 0, access=mmap.ACCESS_READ)
+    magic, version, flags, _, count, _, _, name_cnt = HEADER.unpack_from(mm)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError("not a page trace file: " + path)
+    body = memoryview(mm)[HEADER.size:]
+    if flags & FLAG_VARINT:
+        pages, used = decode_deltas(body, count)
+    else:
+        used = 8 * count
+        pages = body[:used].cast('q')
+    intern = InternTable()
+    if name_cnt:
+        for name in bytes(body[used:]).split(b"\n")[:name_cnt]:
+            intern.intern(name)
+    return pages, intern
+
+
+def load_pages_cached(path, column=0, compress=False):
+    # 원본 텍스트의 크기와 mtime 이 같으면 옆에 저장된 바이너리를 재사용한다
+    bin_path = binary_path(path, column)
+    st = os.stat(path)
+    if os.path.exists(bin_path):
+        fields = read_header(bin_path)
+        if fields is not None and fields[5] == st.st_size and fields[6] == st.st_mtime_ns:
+            return load_binary(bin_path)
+    intern = InternTable()
+    pages = load_pages(path, column, intern)
+    write_binary(bin_path, pages, intern, compress, source=path)
+    return pages, intern
+
+
+def load_sized_pages_cached(path, size_column=2, compress=False):
+    # 페이지 열과 크기 열 캐시가 둘 다 원본과 맞으면 재사용하고, 아니면 한 번에 파싱해 둘 다 새로 쓴다
+    # 반환값은 (pages, sizes, intern)
+    page_path = binary_path(path)
+    size_path = binary_path(path, size_column)
+    st = os.stat(path)
+    if os.path.exists(page_path) and os.path.exists(size_path):
+        page_fields = read_header(page_path)
+        size_fields = read_header(size_path)
+        if (page_fields is not None and size_fields is not None
+                and page_fields[5:7] == size_fields[5:7] == (st.st_size, st.st_mtime_ns)
+                and page_fields[4] == size_fields[4] and size_fields[7] == 0):
+            pages, intern = load_binary(page_path)
+            sizes, _ = load_binary(size_path)
+            return pages, sizes, intern
+    intern = InternTable()
+    pages, sizes = load_sized_pages(path, size_column, intern)
+    write_binary(page_path, pages, intern, compress, source=path)
+    write_binary(size_path, sizes, None, compress, source=path)
+    return pages, sizes, intern
+
+
+def convert(src, dst=None, column=0, compress=False):
+    intern = InternTable()
+    pages = load_pages(src, column, intern)
+    write_binary(dst or binary_path(src, column), pages, intern, compress, source=src)
+    return len(pages)
+
+
+if __name__ == "__main__":
+    # python trace_io.py convert linkbench.trc [out.ptrc] [--column N] [--compress]
+    args = sys.argv[1:]
+    if not args or args[0] != "convert" or len(args) < 2:
+        print("usage: python trace_io.py convert <trace> [out] [--column N] [--compress]")
+        sys.exit(1)
+    compress = "--compress" in args
+    column = 0
+    if "--column" in args:
+        column = int(args[args.index("--column") + 1])
+    positional = [a for i, a in enumerate(args[1:], 1) if not a.startswith("--") and args[i - 1] != "--column"]
+    count = convert(positional[0], positional[1] if len(positional) > 1 else None, column, compress)
+    print("converted", count, "accesses")
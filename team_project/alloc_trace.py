@@ -0,0 +1,257 @@
+"""
+할당기 트레이스(a id size / f id / r id size) 입출력
+
+바이너리 형식(.atrc)은 헤더 뒤에 열 단위 고정 폭 레코드를 둔다.
+- ops   : 요청 종류 1바이트씩 (b'a', b'f', b'r'), 8바이트 경계로 패딩
+- ids   : int64
+- sizes : int64 (f 요청은 0, r 요청은 바뀐 크기)
+FLAG_VARINT 가 켜져 있으면 ids/sizes 는 zigzag delta varint 로 압축된다.
+"""
+
+import mmap
+import os
+import re
+import shutil
+import struct
+import sys
+from array import array
+
+MAGIC = b"ATRC"
+VERSION = 1
+FLAG_VARINT = 1
+# magic, version, flags, reserved, count, 원본 크기, 원본 mtime_ns, 예약
+HEADER = struct.Struct("<4sBBHQQqQ")
+
+OP_ALLOC = ord('a')
+OP_FREE = ord('f')
+OP_REALLOC = ord('r')
+
+# d 는 cuckoo 구현이 쓰던 해제 명령으로 f 와 같게 취급한다
+_REQUEST = re.compile(rb"(?m)^[ \t]*([afdr])[ \t]+(-?\d+)(?:[ \t]+(\d+))?")
+
+
+def parse_text(path):
+    ops = bytearray()
+    ids = array('q')
+    sizes = array('q')
+    with open(path, "rb") as data_file:
+        try:
+            mm = mmap.mmap(data_file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # 빈 파일
+            return ops, ids, sizes
+        with mm:
+            for op, id, size in _REQUEST.findall(mm):
+                ops.append(OP_FREE if op == b'd' else op[0])
+                ids.append(int(id))
+                sizes.append(int(size) if size else 0)
+    return ops, ids, sizes
+
+
+def encode_deltas(values, prev=0):
+    # prev 는 앞 묶음의 마지막 값. 스트리밍으로 나눠 쓸 때 이어서 인코딩한다
+    out = bytearray()
+    for value in values:
+        delta = value - prev
+        prev = value
+        z = delta << 1 if delta >= 0 else ((-delta) << 1) - 1
+        while z >= 0x80:
+            out.append((z & 0x7F) | 0x80)
+            z >>= 7
+        out.append(z)
+    return out
+
+
+def decode_deltas(buf, count, pos=0):
+    values = array('q', bytes(8 * count))
+    prev = 0
+    for i in range(count):
+        z = 0
+        shift = 0
+        while True:
+            byte = buf[pos]
+            pos += 1
+            z |= (byte & 0x7F) << shift
+            if byte < 0x80:
+                break
+            shift += 7
+        prev += (z >> 1) if not z & 1 else -((z + 1) >> 1)
+        values[i] = prev
+    return values, pos
+
+
+def _padded(n):
+    return (n + 7) & ~7
+
+
+def binary_path(path):
+    return path + ".atrc"
+
+
+def write_binary(path, ops, ids, sizes, compress=False, source=None):
+    src_size, src_mtime = 0, 0
+    if source is not None:
+        st = os.stat(source)
+        src_size, src_mtime = st.st_size, st.st_mtime_ns
+    count = len(ops)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as out:
+        out.write(HEADER.pack(MAGIC, VERSION, FLAG_VARINT if compress else 0, 0, count, src_size, src_mtime, 0))
+        out.write(bytes(ops))
+        out.write(bytes(_padded(count) - count))
+        if compress:
+            out.write(encode_deltas(ids))
+            out.write(encode_deltas(sizes))
+        else:
+            out.write(array('q', ids).tobytes())
+            out.write(array('q', sizes).tobytes())
+    os.replace(tmp_path, path)
+
+
+class BinaryWriter:
+    """
+    요청 수를 미리 모르는 .atrc 스트리밍 쓰기
+    열(ops/ids/sizes)마다 임시 파일에 묶음 단위로 모았다가 close() 에서 헤더 뒤에 이어 붙이므로
+    메모리에는 묶음 하나만 남습니다.
+    """
+    BATCH = 1 << 16
+
+    def __init__(self, path, compress=False):
+        self.path = path
+        self.compress = compress
+        self.count = 0
+        self.columns = [open(path + suffix, "w+b") for suffix in (".ops.tmp", ".ids.tmp", ".sizes.tmp")]
+        self.ops = bytearray()
+        self.ids = array('q')
+        self.sizes = array('q')
+        self.prev_id = 0
+        self.prev_size = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self._discard()
+
+    def write(self, op, id, size=0):
+        self.ops.append(op)
+        self.ids.append(id)
+        self.sizes.append(size)
+        if len(self.ops) >= self.BATCH:
+            self._flush()
+
+    def _flush(self):
+        if not self.ops:
+            return
+        ops_file, ids_file, sizes_file = self.columns
+        ops_file.write(self.ops)
+        if self.compress:
+            ids_file.write(encode_deltas(self.ids, self.prev_id))
+            sizes_file.write(encode_deltas(self.sizes, self.prev_size))
+            self.prev_id = self.ids[-1]
+            self.prev_size = self.sizes[-1]
+        else:
+            ids_file.write(self.ids.tobytes())
+            sizes_file.write(self.sizes.tobytes())
+        self.count += len(self.ops)
+        self.ops = bytearray()
+        self.ids = array('q')
+        self.sizes = array('q')
+
+    def _discard(self):
+        for column in self.columns:
+            column.close()
+            os.remove(column.name)
+
+    def close(self):
+        self._flush()
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "wb") as out:
+            out.write(HEADER.pack(MAGIC, VERSION, FLAG_VARINT if self.compress else 0, 0, self.count, 0, 0, 0))
+            for i, column in enumerate(self.columns):
+                column.seek(0)
+                shutil.copyfileobj(column, out, 1 << 20)
+                if i == 0:
+                    out.write(bytes(_padded(self.count) - self.count))
+        self._discard()
+        os.replace(tmp_path, self.path)
+        return self.count
+
+
+def read_header(path):
+    with open(path, "rb") as data_file:
+        header = data_file.read(HEADER.size)
+    if len(header) < HEADER.size:
+        return None
+    fields = HEADER.unpack(header)
+    if fields[0] != MAGIC or fields[1] != VERSION:
+        return None
+    return fields
+
+
+def load_binary(path):
+    """
+    바이너리 트레이스를 mmap 으로 읽어 (ops, ids, sizes) 를 반환합니다.
+    압축하지 않은 파일은 복사 없이 memoryview 로 돌려줍니다.
+    """
+    with open(path, "rb") as data_file:
+        mm = mmap.mmap(data_file.fileno(), 0, access=mmap.ACCESS_READ)
+    magic, version, flags, _, count, _, _, _ = HEADER.unpack_from(mm)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError("not an allocator trace file: " + path)
+    body = memoryview(mm)[HEADER.size:]
+    ops = body[:count]
+    pos = _padded(count)
+    if flags & FLAG_VARINT:
+        ids, pos = decode_deltas(body, count, pos)
+        sizes, pos = decode_deltas(body, count, pos)
+    else:
+        ids = body[pos:pos + 8 * count].cast('q')
+        pos += 8 * count
+        sizes = body[pos:pos + 8 * count].cast('q')
+    return ops, ids, sizes
+
+
+def load_trace(path, compress=False):
+    """
+    텍스트 트레이스를 읽습니다. 원본의 크기와 mtime 이 같으면
+    옆에 캐시된 바이너리를 재사용하고, 아니면 파싱 후 캐시를 새로 씁니다.
+    .atrc 파일을 바로 주면 그대로 읽습니다.
+    """
+    if path.endswith(".atrc"):
+        return load_binary(path)
+    bin_path = binary_path(path)
+    st = os.stat(path)
+    if os.path.exists(bin_path):
+        fields = read_header(bin_path)
+        if fields is not None and fields[5] == st.st_size and fields[6] == st.st_mtime_ns:
+            return load_binary(bin_path)
+    ops, ids, sizes = parse_text(path)
+    write_binary(bin_path, ops, ids, sizes, compress, source=path)
+    return ops, ids, sizes
+
+
+def iter_requests(path):
+    # (op, id, size) 튜플로 요청을 순회. op 는 'a', 'f', 'r'
+    ops, ids, sizes = load_trace(path)
+    for op, id, size in zip(ops, ids, sizes):
+        yield chr(op), id, size
+
+
+def convert(src, dst=None, compress=False):
+    ops, ids, sizes = parse_text(src)
+    write_binary(dst or binary_path(src), ops, ids, sizes, compress, source=src)
+    return len(ops)
+
+
+if __name__ == "__main__":
+    # python alloc_trace.py convert input.txt [out.atrc] [--compress]
+    args = sys.argv[1:]
+    if len(args) < 2 or args[0] != "convert":
+        print("usage: python alloc_trace.py convert <input.txt> [out] [--compress]")
+        sys.exit(1)
+    positional = [a for a in args[1:] if not a.startswith("--")]
+    count = convert(positional[0], positional[1] if len(positional) > 1 else None, "--compress" in args)
+    print("converted", count, "requests")
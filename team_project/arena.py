@@ -0,0 +1,193 @@
+"""
+실제 메모리가 붙은 arena
+
+기존 할당기들은 주소(오프셋) 장부만 관리합니다. ByteArena 는 그 주소 공간 뒤에
+익명 mmap 하나를 두고, malloc 이 그 위의 memoryview 조각을 복사 없이 돌려줍니다.
+- 백엔드는 malloc(id, size) 가 시작 주소를 돌려주는 할당기면 됩니다
+  (ssualloc, 이민영, 홍륜기, buddy_alloc, slab)
+- 블록이 청크 경계를 넘을 수 있어 arena 는 capacity 바이트를 한 번에 예약합니다.
+  건드리지 않은 페이지는 OS 가 실제로 잡지 않으므로 예약만으로는 RSS 가 늘지 않습니다.
+  (bytearray 는 memoryview 가 나가 있는 동안 늘릴 수 없어 쓰지 않습니다)
+- release=True 면 free 뒤 살아 있는 바이트가 0 이 된 청크를 madvise(MADV_DONTNEED) 로 OS 에 돌려줍니다.
+  돌려준 청크는 다음에 닿을 때 0 으로 채워진 새 페이지가 됩니다.
+- realloc/aligned_alloc 은 백엔드에 같은 이름의 메소드가 있을 때 쓸 수 있습니다 (ssualloc, 홍륜기)
+- free 한 뒤에도 호출자가 들고 있는 memoryview 는 유효하지만, 같은 자리가 다른 요청에 재사용될 수 있습니다.
+"""
+
+import mmap
+import sys
+import time
+from array import array
+
+MADV_DONTNEED = getattr(mmap, "MADV_DONTNEED", None)
+
+
+class ByteArena:
+    def __init__(self, backend, capacity=1 << 30, release=False):
+        self.backend = backend
+        self.chunk_size = getattr(backend, "chunk_size", mmap.PAGESIZE)
+        if self.chunk_size % mmap.PAGESIZE:
+            raise ValueError("chunk_size must be a multiple of the page size")
+        self.capacity = capacity
+        self.mm = mmap.mmap(-1, capacity)
+        self.view = memoryview(self.mm)
+        self.blocks = {}  # id -> (start, size)
+        self.chunk_live = array('q')  # 청크별 할당된 바이트 수
+        self.dirty = bytearray()  # 청크별 한 번이라도 할당되어 페이지가 잡혔을 수 있는지
+        self.release = release and MADV_DONTNEED is not None
+        self.released_chunks = 0
+
+    @property
+    def total_memory(self):
+        return self.backend.total_memory
+
+    @property
+    def used_memory(self):
+        return self.backend.used_memory
+
+    def _account(self, start, size, sign):
+        """
+        [start, start + size) 가 걸친 청크마다 살아 있는 바이트 수를 더하거나 뺌
+        - 빼다가 0 이 된 청크 목록을 반환
+        """
+        chunk = self.chunk_size
+        live = self.chunk_live
+        first = start // chunk
+        last = (start + size - 1) // chunk
+        if last >= len(live):
+            grow = last + 1 - len(live)
+            live.frombytes(bytes(8 * grow))
+            self.dirty.extend(bytes(grow))
+        emptied = []
+        for c in range(first, last + 1):
+            lo = max(start, c * chunk)
+            hi = min(start + size, (c + 1) * chunk)
+            live[c] += sign * (hi - lo)
+            if sign > 0:
+                self.dirty[c] = 1
+            elif live[c] == 0:
+                emptied.append(c)
+        return emptied
+
+    def malloc(self, id, size):
+        """
+        size 바이트 블록을 할당하고 arena 위의 memoryview 를 반환
+        """
+        return self._attach(id, size, self.backend.malloc(id, size))
+
+    def aligned_alloc(self, id, size, alignment):
+        """
+        시작 주소가 alignment 배수인 블록을 할당하고 memoryview 를 반환 (캐시 라인, 페이지 정렬 버퍼용)
+        mmap 자체가 페이지 경계에서 시작하므로 페이지 크기까지의 정렬은 실제 주소에서도 지켜집니다.
+        """
+        return self._attach(id, size, self.backend.aligned_alloc(id, size, alignment))
+
+    def _attach(self, id, size, start):
+        if start is None:
+            raise TypeError("backend malloc must return the block start")
+        if start + size > self.capacity:
+            self.backend.free(id)
+            raise MemoryError("arena capacity exceeded")
+        self.blocks[id] = (start, size)
+        if size:
+            self._account(start, size, 1)
+        return self.view[start:start + size]
+
+    def realloc(self, id, size):
+        """
+        블록 크기를 바꾸고 memoryview 를 반환
+        - 백엔드가 제자리에서 늘리거나 줄이면 복사하지 않음
+        - 자리가 바뀌면 원래 내용을 mmap.move 로 옮김 (두 구간이 겹쳐도 안전)
+        """
+        if id not in self.blocks:
+            return self.malloc(id, size)
+        old_start, old_size = self.blocks[id]
+        start = self.backend.realloc(id, size)
+        if start + size > self.capacity:
+            # 옛 내용을 보존할 수 없으므로 블록을 해제하고 실패로 처리
+            self.free(id)
+            raise MemoryError("arena capacity exceeded")
+        # 새 구간을 먼저 세고 내용을 옮긴 뒤에 옛 구간을 빼야 아직 쓰는 청크를 OS 에 돌려주지 않는다
+        if size:
+            self._account(start, size, 1)
+        if start != old_start:
+            self.mm.move(start, old_start, min(old_size, size))
+        if old_size:
+            self._release(self._account(old_start, old_size, -1))
+        self.blocks[id] = (start, size)
+        return self.view[start:start + size]
+
+    def get(self, id):
+        """
+        할당된 블록의 memoryview 를 다시 얻음
+        """
+        start, size = self.blocks[id]
+        return self.view[start:start + size]
+
+    def free(self, id):
+        """
+        블록을 백엔드에 돌려줌. release 면 완전히 빈 청크는 OS 에도 돌려줌
+        """
+        block = self.blocks.pop(id, None)
+        if block is None:
+            print(f"Block with ID {id} not found")
+            return
+        start, size = block
+        self.backend.free(id)
+        if not size:
+            return
+        self._release(self._account(start, size, -1))
+
+    def _release(self, emptied):
+        """
+        release 면 살아 있는 바이트가 0 이 된 청크를 OS 에 돌려줌
+        """
+        if self.release:
+            for c in emptied:
+                if self.dirty[c]:
+                    self.mm.madvise(MADV_DONTNEED, c * self.chunk_size, self.chunk_size)
+                    self.dirty[c] = 0
+                    self.released_chunks += 1
+
+    def close(self):
+        # 밖에 나간 memoryview 가 남아 있으면 BufferError
+        self.view.release()
+        self.mm.close()
+
+    def print_stats(self):
+        self.backend.print_stats()
+        resident = sum(self.dirty)
+        print(f"Touched chunks: {resident} ({resident * self.chunk_size / (1024 * 1024):.2f} MB)")
+        print(f"Released chunks: {self.released_chunks}")
+
+
+if __name__ == "__main__":
+    # python arena.py [trace] [--release]  (백엔드: ssualloc, 할당한 버퍼에 id 를 써 보며 재생)
+    # r 요청을 재생하려면 realloc 이 있는 백엔드가 필요하다
+    import os
+    from alloc_trace import iter_requests
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "박건우"))
+    from ssualloc import Allocator
+
+    args = [a for a in sys.argv[1:] if a != "--release"]
+    arena = ByteArena(Allocator(), release="--release" in sys.argv)
+    path = args[0] if args else "./input.txt"
+
+    start_time = time.time()
+    for op, id, size in iter_requests(path):
+        if op == 'a':
+            buf = arena.malloc(id, size)
+            buf[:8] = id.to_bytes(8, "little")[:len(buf)]
+        elif op == 'f':
+            arena.free(id)
+        elif op == 'r':
+            kept = min(8, size, arena.blocks[id][1]) if id in arena.blocks else 0
+            buf = arena.realloc(id, size)
+            # 제자리든 옮겼든 앞쪽 내용은 그대로여야 한다
+            assert bytes(buf[:kept]) == id.to_bytes(8, "little")[:kept]
+            buf[:8] = id.to_bytes(8, "little")[:len(buf)]
+    buf = None
+
+    end_time = time.time()
+    arena.print_stats()
+    print(f"Execution time: {end_time - start_time:.2f} seconds")
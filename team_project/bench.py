@@ -0,0 +1,220 @@
+"""
+할당기 비교 벤치마크
+
+모든 백엔드는 같은 Allocator 프로토콜을 따른다고 봅니다.
+- malloc(id, size) : 요청 하나 할당
+- free(id)         : id 로 해제
+- realloc(id, size) : (선택) 크기 변경. 없으면 free 후 malloc 으로 재생하고 항상 옮긴 것으로 셉니다
+- total_memory     : 확보한 arena 크기 (바이트)
+- used_memory      : 요청 크기의 합 (바이트)
+예전 구현 중 arena/in-use 를 다른 이름으로 들고 있는 것은 memory_stats() 가 맞춰 읽습니다.
+
+트레이스는 alloc_trace.load_trace() 로 한 번 읽어 .atrc 캐시를 쓰고,
+백엔드마다 새 프로세스에서 재생해 peak RSS 가 서로 섞이지 않게 합니다.
+
+    python bench.py [trace] [--backends avl,rbtree,...] [--json out.json]
+"""
+
+import importlib.util
+import json
+import multiprocessing
+import os
+import platform
+import resource
+import subprocess
+import sys
+import time
+from array import array
+
+from alloc_trace import OP_ALLOC, OP_FREE, load_trace
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+# 이름 -> (파일 경로, 클래스 이름, 생성자 인자). 인자 backend 는 다른 백엔드 이름으로, 그 인스턴스를 넘긴다
+BACKENDS = {
+    "avl": ("박건우/ssualloc.py", "Allocator", {}),
+    "seglist": ("이민영/allocator.py", "Allocator", {"verbose": False}),
+    "bitmap": ("전용하/main1.py", "Allocator", {}),
+    "cuckoo": ("정수연/allocator10_cuckoo 2.py", "CuckooHash", {"size": 131072}),
+    "rbtree": ("홍륜기/allocator.py", "Allocator", {}),
+    "buddy": ("buddy_alloc.py", "Allocator", {}),
+    "slab": ("slab.py", "SlabAllocator", {"backend": "buddy"}),  # buddy 앞에 슬랩 계층
+}
+
+
+def register(name, path, class_name, **kwargs):
+    """
+    백엔드 등록. path 는 team_project 기준 상대 경로 또는 절대 경로
+    """
+    BACKENDS[name] = (path, class_name, kwargs)
+
+
+def load_class(path, class_name):
+    """
+    파일 경로로 모듈을 읽어 클래스를 반환
+    - 파일 이름에 공백이 있거나 같은 폴더 모듈을 import 하는 구현도 있어 경로로 직접 읽습니다
+    """
+    path = os.path.join(HERE, path)
+    directory = os.path.dirname(path)
+    if directory not in sys.path:
+        sys.path.insert(0, directory)
+    name = "bench_" + os.path.splitext(os.path.basename(path))[0].replace(" ", "_")
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return getattr(module, class_name)
+
+
+def make_backend(name, backends=BACKENDS):
+    path, class_name, kwargs = backends[name]
+    if "backend" in kwargs:
+        kwargs = dict(kwargs, backend=make_backend(kwargs["backend"], backends))
+    return load_class(path, class_name)(**kwargs)
+
+
+def memory_stats(allocator):
+    """
+    (arena 바이트, in-use 바이트)
+    """
+    if hasattr(allocator, "memory_size"):  # cuckoo: 키마다 chunk 하나
+        return allocator.memory_size, allocator.used_memory
+    if hasattr(allocator, "total_chunks"):  # 청크 비트맵: 청크 단위로만 셈
+        chunks = sum(count for runs in allocator.allocations.values() for _, count in runs)
+        return allocator.total_chunks * allocator.chunk_size, chunks * allocator.chunk_size
+    return allocator.total_memory, allocator.used_memory
+
+
+def percentile(sorted_values, q):
+    if not sorted_values:
+        return 0
+    return sorted_values[min(len(sorted_values) - 1, int(q * len(sorted_values)))]
+
+
+def replay(allocator, ops, ids, sizes):
+    """
+    트레이스를 재생하며 요청마다 걸린 시간(ns)을 모아 반환
+    반환값은 (latencies, realloc 이 없어 free + malloc 으로 대신한 r 요청 수)
+    """
+    latencies = array('q', bytes(8 * len(ops)))
+    malloc = allocator.malloc
+    free = allocator.free
+    realloc = getattr(allocator, "realloc", None)
+    emulated = 0
+    clock = time.perf_counter_ns
+    i = 0
+    for op, id, size in zip(ops, ids, sizes):
+        t0 = clock()
+        if op == OP_ALLOC:
+            malloc(id, size)
+        elif op == OP_FREE:
+            free(id)
+        elif realloc is not None:
+            realloc(id, size)
+        else:
+            free(id)
+            malloc(id, size)
+            emulated += 1
+        latencies[i] = clock() - t0
+        i += 1
+    return latencies, emulated
+
+
+def run_backend(name, path, backends=BACKENDS):
+    """
+    백엔드 하나를 재생하고 결과 dict 를 반환 (run() 이 별도 프로세스에서 부름)
+    """
+    ops, ids, sizes = load_trace(path)
+    allocator = make_backend(name, backends)
+    start = time.perf_counter()
+    latencies, emulated = replay(allocator, ops, ids, sizes)
+    elapsed = time.perf_counter() - start
+    latencies = sorted(latencies)
+    arena, in_use = memory_stats(allocator)
+    in_place = getattr(allocator, "realloc_in_place", 0)
+    moved = getattr(allocator, "realloc_moved", 0) + emulated
+    # Linux 의 ru_maxrss 는 KB 단위
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+    return {
+        "backend": name,
+        "ops": len(latencies),
+        "seconds": elapsed,
+        "ops_per_sec": len(latencies) / elapsed if elapsed > 0 else 0.0,
+        "p50_us": percentile(latencies, 0.50) / 1000,
+        "p99_us": percentile(latencies, 0.99) / 1000,
+        "max_us": (latencies[-1] if latencies else 0) / 1000,
+        "peak_rss_mb": peak_rss / (1024 * 1024),
+        "arena_mb": arena / (1024 * 1024),
+        "in_use_mb": in_use / (1024 * 1024),
+        "utilization": in_use / arena if arena > 0 else 0.0,
+        "reallocs": in_place + moved,
+        "realloc_in_place": in_place,
+        "copied_bytes": getattr(allocator, "copied_bytes", None),  # 백엔드가 세지 않으면 None
+    }
+
+
+def _revision():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=HERE,
+                                       stderr=subprocess.DEVNULL, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(path, names=None):
+    """
+    names 의 백엔드를 차례로 재생해 결과 목록을 반환
+    - 백엔드마다 spawn 한 새 프로세스를 써서 메모리와 RSS 가 이전 실행의 영향을 받지 않습니다
+    """
+    names = list(names or BACKENDS)
+    load_trace(path)  # .atrc 캐시를 미리 만들어 둔다
+    context = multiprocessing.get_context("spawn")
+    results = []
+    for name in names:
+        with context.Pool(1) as pool:
+            # register() 로 추가한 항목도 보이도록 등록표를 함께 넘긴다
+            results.append(pool.apply(run_backend, (name, path, BACKENDS)))
+    return results
+
+
+def print_table(results):
+    header = f"{'backend':<10}{'ops/s':>12}{'p50 us':>10}{'p99 us':>10}{'max us':>12}{'RSS MB':>9}{'arena MB':>10}{'in-use MB':>11}{'util':>8}{'realloc in-place':>18}"
+    print(header)
+    print("-" * len(header))
+    for r in results:
+        print(f"{r['backend']:<10}{r['ops_per_sec']:>12,.0f}{r['p50_us']:>10.2f}{r['p99_us']:>10.2f}{r['max_us']:>12.2f}"
+              f"{r['peak_rss_mb']:>9.1f}{r['arena_mb']:>10.2f}{r['in_use_mb']:>11.2f}{r['utilization']:>8.2%}"
+              f"{(str(r['realloc_in_place']) + '/' + str(r['reallocs'])) if r['reallocs'] else '-':>18}")
+
+
+def write_json(path, trace, results):
+    report = {
+        "trace": os.path.abspath(trace),
+        "revision": _revision(),
+        "python": platform.python_version(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "results": results,
+    }
+    with open(path, "w") as out:
+        json.dump(report, out, indent=2)
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    opts = {}
+    positional = []
+    while args:
+        arg = args.pop(0)
+        if arg.startswith("--"):
+            opts[arg] = args.pop(0)
+        else:
+            positional.append(arg)
+    trace = positional[0] if positional else "./input.txt"
+    names = opts["--backends"].split(",") if "--backends" in opts else None
+    for name in names or ():
+        if name not in BACKENDS:
+            print("unknown backend:", name, "(choose from", ", ".join(BACKENDS) + ")")
+            sys.exit(1)
+    results = run(trace, names)
+    print_table(results)
+    if "--json" in opts:
+        write_json(opts["--json"], trace, results)
@@ -0,0 +1,167 @@
+import time
+
+MIN_ORDER = 4  # 가장 작은 블록 16B
+
+
+class Allocator:
+    """
+    이진 버디 할당기
+
+    - 블록 크기는 2^order, arena 는 chunk_size(2^max_order) 크기의 영역 단위로 늘어납니다.
+    - order 별 free list 와 비어 있지 않은 order 의 비트맵으로 분할할 블록을 O(1) 에 찾습니다.
+    - order 별 버디 쌍 비트(두 버디의 빈 상태 XOR)로 병합 여부를 바로 판단합니다.
+    - 분할/병합은 order 하나씩 오르내리므로 O(max_order) 입니다.
+    - chunk_size 보다 큰 요청은 2의 거듭제곱 크기의 전용 영역을 받고, 해제되면 같은 order 요청에 재사용됩니다.
+    """
+    def __init__(self, chunk_size=16 * 1024):
+        self.max_order = max(MIN_ORDER, (chunk_size - 1).bit_length())
+        self.chunk_size = 1 << self.max_order
+        self.free_lists = [dict() for _ in range(self.max_order + 1)]  # order -> {시작 주소: None}
+        self.order_bitmap = 0  # i 번째 비트: free_lists[i] 가 비어 있지 않음
+        self.pair_bits = [bytearray() for _ in range(self.max_order)]  # 버디 쌍의 빈 상태 XOR, 쌍 하나에 1비트
+        self.large_free = {}  # order -> [시작 주소] (chunk_size 보다 큰 블록)
+        self.allocations = {}  # id -> (시작 주소, order, 요청 크기)
+        self.total_memory = 0
+        self.used_memory = 0
+        self.block_memory = 0  # 할당된 블록 크기의 합 (내부 단편화 포함)
+
+    def print_stats(self):
+        """
+        메모리 사용 통계 출력
+        """
+        total_arena = self.total_memory / (1024 * 1024)
+        in_use = self.used_memory / (1024 * 1024)
+        utilization = self.used_memory / self.total_memory if self.total_memory > 0 else 0
+        internal = (self.block_memory - self.used_memory) / (1024 * 1024)
+        print(f"Arena: {total_arena:.2f} MB")
+        print(f"In-use: {in_use:.2f} MB")
+        print(f"Utilization: {utilization:.2%}")
+        print(f"Internal fragmentation: {internal:.2f} MB")
+
+    def _order(self, size):
+        """
+        size 를 담을 수 있는 가장 작은 order
+        """
+        return max(MIN_ORDER, (max(size, 1) - 1).bit_length())
+
+    def _toggle(self, start, order):
+        """
+        start 블록이 속한 버디 쌍의 비트를 뒤집고 새 값을 반환
+        """
+        bits = self.pair_bits[order]
+        index = start >> (order + 1)
+        mask = 1 << (index & 7)
+        bits[index >> 3] ^= mask
+        return bits[index >> 3] & mask
+
+    def _push(self, start, order):
+        self.free_lists[order][start] = None
+        self.order_bitmap |= 1 << order
+
+    def _pop(self, order):
+        """
+        order 의 free list 에서 가장 최근에 넣은 블록을 꺼냄
+        - 앞에서 꺼내면 dict 앞쪽에 지운 자리가 쌓여 매번 건너뛰어야 하므로 popitem(LIFO) 을 씁니다
+        """
+        free_list = self.free_lists[order]
+        start, _ = free_list.popitem()
+        if not free_list:
+            self.order_bitmap &= ~(1 << order)
+        return start
+
+    def _remove(self, start, order):
+        free_list = self.free_lists[order]
+        del free_list[start]
+        if not free_list:
+            self.order_bitmap &= ~(1 << order)
+
+    def _grow(self, size):
+        """
+        arena 끝에 size 바이트 영역을 추가하고 시작 주소를 반환
+        """
+        start = self.total_memory
+        self.total_memory += size
+        for order in range(MIN_ORDER, self.max_order):
+            bits = self.pair_bits[order]
+            need = (((self.total_memory >> (order + 1)) + 7) >> 3) - len(bits)
+            if need > 0:
+                bits.extend(bytes(need))
+        return start
+
+    def _malloc_large(self, order):
+        blocks = self.large_free.get(order)
+        if blocks:
+            return blocks.pop()
+        return self._grow(1 << order)
+
+    def malloc(self, id, size):
+        """
+        메모리 할당 요청 처리
+        - 요청 order 이상에서 비어 있지 않은 가장 작은 order 를 비트맵으로 찾음
+        - 블록을 반씩 나누며 남는 버디는 free list 에 넣음
+        """
+        order = self._order(size)
+        if order > self.max_order:
+            start = self._malloc_large(order)
+        else:
+            candidates = self.order_bitmap >> order
+            if candidates:
+                k = order + (candidates & -candidates).bit_length() - 1
+                start = self._pop(k)
+                if k < self.max_order:
+                    self._toggle(start, k)
+            else:
+                k = self.max_order
+                start = self._grow(self.chunk_size)
+            while k > order:
+                k -= 1
+                buddy = start + (1 << k)
+                self._push(buddy, k)
+                self._toggle(buddy, k)
+        self.allocations[id] = (start, order, size)
+        self.used_memory += size
+        self.block_memory += 1 << order
+        return start
+
+    def free(self, id):
+        """
+        메모리 해제 요청 처리
+        - 버디 쌍 비트를 뒤집어 0 이 되면 버디도 비어 있으므로 병합하고 한 order 위로 올라감
+        """
+        if id not in self.allocations:
+            print(f"Block with ID {id} not found")
+            return
+        start, order, size = self.allocations.pop(id)
+        self.used_memory -= size
+        self.block_memory -= 1 << order
+        if order > self.max_order:
+            self.large_free.setdefault(order, []).append(start)
+            return
+        while order < self.max_order:
+            if self._toggle(start, order):
+                break
+            buddy = start ^ (1 << order)
+            self._remove(buddy, order)
+            start = min(start, buddy)
+            order += 1
+        self._push(start, order)
+
+
+if __name__ == "__main__":
+    # python buddy_alloc.py [trace]
+    import sys
+    from alloc_trace import iter_requests
+
+    allocator = Allocator()
+    path = sys.argv[1] if len(sys.argv) > 1 else "./input.txt"
+
+    start_time = time.time()
+    for op, id, size in iter_requests(path):
+        if op == 'a':
+            allocator.malloc(id, size)
+        elif op == 'f':
+            allocator.free(id)
+
+    end_time = time.time()
+    allocator.print_stats()
+    print(f"Execution time: {end_time - start_time:.2f} seconds")
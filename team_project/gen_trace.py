@@ -0,0 +1,256 @@
+"""
+합성 할당기 트레이스 생성기
+
+input.txt 와 같은 텍스트 형식(a id size / f id / r id size) 이나 바이너리 .atrc 를 만듭니다.
+- 크기 분포   : FixedSizes(고정 클래스), LogNormalSizes, BimodalSizes
+- 수명 규칙   : "lifo"(스택), "fifo"(큐), "random" + 일부 객체를 끝까지 살려 두는 outlier 비율
+- 단계(Phase) : 단계마다 요청 수, 크기 분포, 수명 규칙, 목표 live heap, realloc 비율을 따로 줍니다
+같은 seed 면 같은 트레이스가 나오고, 요청은 하나씩 만들어 바로 써서 live 객체 외에는 메모리에 남지 않습니다.
+
+    python gen_trace.py out.txt [--ops N] [--seed S] [--sizes lognormal,bimodal] [--lifetime random,fifo]
+                                [--live BYTES] [--outliers P] [--realloc P] [--no-drain] [--compress]
+    (out 이 .atrc 로 끝나면 바이너리, --sizes/--lifetime 에 여러 개를 주면 그 수만큼 단계를 나눕니다)
+"""
+
+import math
+import random
+import sys
+
+from alloc_trace import OP_ALLOC, OP_FREE, OP_REALLOC, BinaryWriter
+
+
+class FixedSizes:
+    """
+    정해진 크기 클래스 중 하나를 가중치에 따라 고름
+    """
+    def __init__(self, classes=(16, 32, 64, 128, 256, 512, 1024, 4096), weights=None):
+        self.classes = list(classes)
+        weights = weights or [1] * len(self.classes)
+        self.cum_weights = []
+        total = 0
+        for w in weights:
+            total += w
+            self.cum_weights.append(total)
+
+    def sample(self, rng):
+        return rng.choices(self.classes, cum_weights=self.cum_weights)[0]
+
+
+class LogNormalSizes:
+    """
+    로그 정규 분포. 중앙값은 e^mu 바이트이고 [low, high] 로 자름
+    """
+    def __init__(self, mu=math.log(128), sigma=1.0, low=1, high=1 << 20):
+        self.mu = mu
+        self.sigma = sigma
+        self.low = low
+        self.high = high
+
+    def sample(self, rng):
+        return min(self.high, max(self.low, int(rng.lognormvariate(self.mu, self.sigma))))
+
+
+class BimodalSizes:
+    """
+    대부분은 작은 객체, p_large 확률로 큰 객체 (각 구간 안에서는 균등 분포)
+    """
+    def __init__(self, small=(16, 256), large=(4096, 64 * 1024), p_large=0.05):
+        self.small = small
+        self.large = large
+        self.p_large = p_large
+
+    def sample(self, rng):
+        low, high = self.large if rng.random() < self.p_large else self.small
+        return rng.randint(low, high)
+
+
+SIZE_MODELS = {
+    "fixed": FixedSizes,
+    "lognormal": LogNormalSizes,
+    "bimodal": BimodalSizes,
+}
+
+LIFETIMES = ("lifo", "fifo", "random")
+
+
+class Phase:
+    """
+    트레이스의 한 구간
+    - ops      : 이 단계에서 만들 요청 수
+    - sizes    : sample(rng) 를 가진 크기 분포
+    - lifetime : "lifo" / "fifo" / "random" 중 해제할 객체를 고르는 규칙
+    - live     : 목표 live heap (바이트). live 가 이보다 작을수록 할당이 많아짐
+    - outliers : 할당 중 이 비율은 해제 대상에서 빼서 트레이스 끝까지 살려 둠
+    - reallocs : 요청 중 이 비율은 살아 있는 객체 하나의 크기를 바꾸는 r 요청
+                 (3/4 는 1~2배로 늘리고 1/4 는 절반으로 줄임)
+    """
+    def __init__(self, ops, sizes=None, lifetime="random", live=16 << 20, outliers=0.0, reallocs=0.0):
+        if lifetime not in LIFETIMES:
+            raise ValueError("unknown lifetime: " + lifetime)
+        self.ops = ops
+        self.sizes = sizes or LogNormalSizes()
+        self.lifetime = lifetime
+        self.live = live
+        self.outliers = outliers
+        self.reallocs = reallocs
+
+
+class LivePool:
+    """
+    해제 후보 객체 모음. 규칙에 따라 다음에 해제할 객체를 O(1) 에 꺼냄
+    - 리스트 하나와 앞쪽 시작 위치(head)로 스택/큐를 함께 표현하고, random 은 끝 원소와 자리를 바꿔 지웁니다
+    """
+    def __init__(self):
+        self.items = []
+        self.head = 0
+
+    def __len__(self):
+        return len(self.items) - self.head
+
+    def push(self, item):
+        self.items.append(item)
+
+    def resize(self, rng):
+        """
+        임의의 객체 하나의 크기를 바꾸고 (id, 이전 크기, 새 크기) 를 반환
+        """
+        i = rng.randrange(self.head, len(self.items))
+        id, size = self.items[i]
+        if rng.random() < 0.75:
+            new_size = size + rng.randint(1, max(1, size))
+        else:
+            new_size = max(1, size // 2)
+        self.items[i] = (id, new_size)
+        return id, size, new_size
+
+    def pop(self, lifetime, rng):
+        items = self.items
+        if lifetime == "lifo":
+            return items.pop()
+        if lifetime == "fifo":
+            item = items[self.head]
+            self.head += 1
+            if self.head * 2 > len(items):
+                # 앞쪽 빈 자리가 절반을 넘으면 당겨서 메모리를 돌려준다
+                del items[:self.head]
+                self.head = 0
+            return item
+        i = rng.randrange(self.head, len(items))
+        item = items[i]
+        last = items.pop()
+        if i < len(items):
+            items[i] = last
+        return item
+
+
+def generate(phases, seed=None, drain=True):
+    """
+    (op, id, size) 를 하나씩 내보내는 제너레이터. op 는 alloc_trace.OP_ALLOC / OP_FREE / OP_REALLOC
+    (OP_REALLOC 의 size 는 바뀐 크기, OP_FREE 의 size 는 0)
+    - 할당 확률은 live heap 이 목표보다 작으면 1 에 가깝고, 목표에서 0.5, 두 배면 0 이 됩니다
+    - 단계가 바뀌어도 live 객체는 그대로 이어집니다
+    - drain 이면 마지막에 남은 객체(outlier 포함)를 모두 해제합니다
+    """
+    rng = random.Random(seed)
+    pool = LivePool()
+    outliers = []
+    live_bytes = 0
+    next_id = 0
+    for phase in phases:
+        sample = phase.sizes.sample
+        target = phase.live
+        for _ in range(phase.ops):
+            if phase.reallocs and pool and rng.random() < phase.reallocs:
+                id, size, new_size = pool.resize(rng)
+                live_bytes += new_size - size
+                yield OP_REALLOC, id, new_size
+                continue
+            p_alloc = 1.0 - 0.5 * live_bytes / target if target > 0 else 0.0
+            if not pool or rng.random() < p_alloc:
+                size = sample(rng)
+                id = next_id
+                next_id += 1
+                live_bytes += size
+                if phase.outliers and rng.random() < phase.outliers:
+                    outliers.append((id, size))
+                else:
+                    pool.push((id, size))
+                yield OP_ALLOC, id, size
+            else:
+                id, size = pool.pop(phase.lifetime, rng)
+                live_bytes -= size
+                yield OP_FREE, id, 0
+    if drain:
+        while pool:
+            id, _ = pool.pop("fifo", rng)
+            yield OP_FREE, id, 0
+        for id, _ in outliers:
+            yield OP_FREE, id, 0
+
+
+def write_text(path, requests, batch=1 << 16):
+    count = 0
+    lines = []
+    with open(path, "w") as out:
+        for op, id, size in requests:
+            if op == OP_FREE:
+                lines.append(f"f {id}\n")
+            else:
+                lines.append(f"{chr(op)} {id} {size}\n")
+            if len(lines) >= batch:
+                out.write("".join(lines))
+                count += len(lines)
+                lines = []
+        out.write("".join(lines))
+        count += len(lines)
+    return count
+
+
+def write_trace(path, requests, compress=False):
+    """
+    경로가 .atrc 로 끝나면 바이너리, 아니면 텍스트로 씀. 쓴 요청 수를 반환
+    """
+    if not path.endswith(".atrc"):
+        return write_text(path, requests)
+    with BinaryWriter(path, compress) as writer:
+        write = writer.write
+        for op, id, size in requests:
+            write(op, id, size)
+    return writer.count
+
+
+def parse_bytes(text):
+    # 16M, 512K 같은 크기 표기
+    units = {"K": 1 << 10, "M": 1 << 20, "G": 1 << 30}
+    text = text.upper().rstrip("B")
+    if text and text[-1] in units:
+        return int(float(text[:-1]) * units[text[-1]])
+    return int(text)
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    if not args or args[0].startswith("--"):
+        print(__doc__)
+        sys.exit(1)
+    path = args[0]
+    flags = {"--no-drain", "--compress"}
+    rest = [a for a in args[1:] if a not in flags]
+    opts = dict(zip(rest[::2], rest[1::2]))
+    total_ops = int(float(opts.get("--ops", "1000000")))
+    sizes = opts.get("--sizes", "lognormal").split(",")
+    lifetimes = opts.get("--lifetime", "random").split(",")
+    for name in sizes:
+        if name not in SIZE_MODELS:
+            print("unknown size model:", name, "(choose from", ", ".join(SIZE_MODELS) + ")")
+            sys.exit(1)
+    count = max(len(sizes), len(lifetimes))
+    phases = []
+    for i in range(count):
+        ops = total_ops // count + (1 if i < total_ops % count else 0)
+        phases.append(Phase(ops, SIZE_MODELS[sizes[i % len(sizes)]](), lifetimes[i % len(lifetimes)],
+                            parse_bytes(opts.get("--live", "16M")), float(opts.get("--outliers", "0")),
+                            float(opts.get("--realloc", "0"))))
+    seed = int(opts["--seed"]) if "--seed" in opts else 0
+    written = write_trace(path, generate(phases, seed, "--no-drain" not in args), "--compress" in args)
+    print("wrote", written, "requests to", path)
@@ -0,0 +1,184 @@
+import sys
+import time
+
+ALIGN = 16  # 가장 작은 크기 클래스이자 클래스 간격의 최소 단위
+CLASS_STEPS = 8  # 256B 이상에서 2의 거듭제곱 구간 하나를 나누는 클래스 수
+MIN_SLOTS = 8  # 슬랩 하나에 최소 이만큼의 객체가 들어가야 작은 객체로 취급
+
+
+def size_classes(max_small):
+    """
+    max_small 이하의 크기 클래스 목록
+    - 256B 까지는 16B 간격, 그 위로는 2의 거듭제곱 구간마다 CLASS_STEPS 개
+    """
+    classes = list(range(ALIGN, min(256, max_small) + 1, ALIGN))
+    base = 256
+    while base < max_small:
+        step = base // CLASS_STEPS
+        for k in range(1, CLASS_STEPS + 1):
+            if base + k * step > max_small:
+                break
+            classes.append(base + k * step)
+        base *= 2
+    return classes
+
+
+class Slab:
+    """
+    백엔드에서 받은 청크 하나를 같은 크기의 객체 슬롯으로 나눈 것
+    - bitmap: i 번째 비트가 1 이면 i 번째 슬롯이 비어 있음
+    - start: 백엔드가 돌려준 청크 시작 주소 (주소를 돌려주지 않는 백엔드면 None)
+    """
+    def __init__(self, id, size_class, slots, start=None):
+        self.id = id
+        self.start = start
+        self.size_class = size_class
+        self.slots = slots
+        self.bitmap = (1 << slots) - 1
+        self.free_count = slots
+
+
+class SlabAllocator:
+    """
+    작은 요청을 크기 클래스별 슬랩에서 처리하는 앞단 할당기
+
+    - 백엔드는 malloc(id, size) / free(id) 와 chunk_size 를 가진 어떤 할당기든 됩니다.
+    - 슬랩 하나는 백엔드의 chunk_size 만큼을 한 번에 받아 같은 크기의 슬롯으로 나눕니다.
+    - 크기 -> 클래스 변환은 표 조회, 슬롯 선택은 비트맵의 최하위 비트라 작은 할당/해제는 O(1) 이고
+      트리 탐색이나 분할을 거치지 않습니다.
+    - 슬랩이 모두 비면 백엔드에 돌려줍니다. 단, 클래스마다 빈 슬랩 하나는 남겨 두어
+      할당/해제가 번갈아 올 때 백엔드를 오가지 않게 합니다.
+    - chunk_size // MIN_SLOTS 보다 큰 요청은 그대로 백엔드로 넘깁니다.
+    """
+    def __init__(self, backend):
+        self.backend = backend
+        self.chunk_size = backend.chunk_size
+        self.max_small = self.chunk_size // MIN_SLOTS // ALIGN * ALIGN
+        self.classes = size_classes(self.max_small)
+        # (size + ALIGN - 1) // ALIGN -> 클래스 번호
+        self.class_table = []
+        index = 0
+        for units in range(self.max_small // ALIGN + 1):
+            while self.classes[index] < units * ALIGN:
+                index += 1
+            self.class_table.append(index)
+        self.partial = [dict() for _ in self.classes]  # 클래스 -> {빈 슬롯이 있는 슬랩: None}
+        self.objects = {}  # id -> (슬랩, 슬롯 번호, 요청 크기)
+        self.large = {}  # 백엔드로 바로 넘긴 id -> 요청 크기
+        self.slab_count = 0
+        self.next_slab_id = 0
+        self.used_memory = 0
+
+    @property
+    def total_memory(self):
+        """
+        백엔드 arena 크기 (슬랩과 큰 객체를 모두 포함)
+        """
+        backend = self.backend
+        if hasattr(backend, "total_memory"):
+            return backend.total_memory
+        return backend.total_chunks * backend.chunk_size
+
+    def print_stats(self):
+        """
+        메모리 사용 통계 출력
+        - In-use 는 요청 크기의 합이므로 슬랩 내부의 클래스 올림과 빈 슬롯은 단편화로 잡힙니다
+        """
+        arena = self.total_memory
+        total_arena = arena / (1024 * 1024)
+        in_use = self.used_memory / (1024 * 1024)
+        utilization = self.used_memory / arena if arena > 0 else 0
+        slab_memory = self.slab_count * self.chunk_size / (1024 * 1024)
+        print(f"Arena: {total_arena:.2f} MB")
+        print(f"In-use: {in_use:.2f} MB")
+        print(f"Utilization: {utilization:.2%}")
+        print(f"Slabs: {self.slab_count} ({slab_memory:.2f} MB), small objects: {len(self.objects)}")
+
+    def _new_slab(self, index):
+        """
+        백엔드에서 청크 하나를 받아 index 클래스의 슬랩을 만듦
+        - 슬랩의 백엔드 id 는 요청 id 와 겹치지 않도록 ("slab", n) 튜플을 씁니다
+        """
+        slab_id = ("slab", self.next_slab_id)
+        self.next_slab_id += 1
+        start = self.backend.malloc(slab_id, self.chunk_size)
+        self.slab_count += 1
+        slab = Slab(slab_id, index, self.chunk_size // self.classes[index], start)
+        self.partial[index][slab] = None
+        return slab
+
+    def malloc(self, id, size):
+        """
+        메모리 할당 요청 처리
+        - 작은 요청: 클래스의 빈 슬롯이 있는 슬랩에서 비트맵 최하위 비트 슬롯을 사용
+        - 큰 요청: 백엔드에 그대로 전달
+        - 백엔드가 주소를 돌려주면 객체의 주소(슬랩 시작 + 슬롯 번호 * 클래스 크기)를 반환
+        """
+        if size > self.max_small:
+            start = self.backend.malloc(id, size)
+            self.large[id] = size
+            self.used_memory += size
+            return start
+        index = self.class_table[(size + ALIGN - 1) // ALIGN]
+        partial = self.partial[index]
+        if not partial:
+            self._new_slab(index)
+        # 앞에서 꺼내면 dict 앞쪽에 지운 자리가 쌓이므로 popitem 으로 꺼내고 빈 슬롯이 남으면 다시 넣는다
+        slab, _ = partial.popitem()
+        low = slab.bitmap & -slab.bitmap
+        slab.bitmap ^= low
+        slab.free_count -= 1
+        if slab.free_count:
+            partial[slab] = None
+        slot = low.bit_length() - 1
+        self.objects[id] = (slab, slot, size)
+        self.used_memory += size
+        if slab.start is not None:
+            return slab.start + slot * self.classes[index]
+
+    def free(self, id):
+        """
+        메모리 해제 요청 처리
+        - 슬롯 비트를 다시 켜고, 슬랩이 모두 비면 (클래스의 마지막 슬랩이 아닌 한) 백엔드에 반환
+        """
+        entry = self.objects.pop(id, None)
+        if entry is None:
+            size = self.large.pop(id, None)
+            if size is None:
+                print(f"Block with ID {id} not found")
+                return
+            self.backend.free(id)
+            self.used_memory -= size
+            return
+        slab, slot, size = entry
+        self.used_memory -= size
+        partial = self.partial[slab.size_class]
+        if slab.free_count == 0:
+            partial[slab] = None
+        slab.bitmap |= 1 << slot
+        slab.free_count += 1
+        if slab.free_count == slab.slots and len(partial) > 1:
+            del partial[slab]
+            self.backend.free(slab.id)
+            self.slab_count -= 1
+
+
+if __name__ == "__main__":
+    # python slab.py [trace]  (백엔드: buddy_alloc)
+    from buddy_alloc import Allocator
+
+    from alloc_trace import iter_requests
+
+    allocator = SlabAllocator(Allocator())
+    path = sys.argv[1] if len(sys.argv) > 1 else "./input.txt"
+
+    start_time = time.time()
+    for op, id, size in iter_requests(path):
+        if op == 'a':
+            allocator.malloc(id, size)
+        elif op == 'f':
+            allocator.free(id)
+
+    end_time = time.time()
+    allocator.print_stats()
+    print(f"Execution time: {end_time - start_time:.2f} seconds")
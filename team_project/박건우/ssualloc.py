@@ -1,42 +1,45 @@
 import time
 
-class ListNode:
-    """
-    이중 연결 리스트의 노드를 나타내는 클래스
-    """
-    def __init__(self, start, size):
-        self.start = start  # 메모리 블록의 시작 주소
-        self.size = size    # 메모리 블록의 크기
-        self.prev = None    # 이전 노드에 대한 포인터
-        self.next = None    # 다음 노드에 대한 포인터
-
 class TreeNode:
     """
     AVL 트리의 노드를 나타내는 클래스
     """
+    __slots__ = ("start", "size", "height", "min_start", "left", "right")
+
     def __init__(self, start, size):
         self.start = start  # 메모리 블록의 시작 주소
         self.size = size    # 메모리 블록의 크기
         self.height = 1     # 노드의 높이
+        self.min_start = start  # 서브트리에서 가장 작은 시작 주소 (first-fit 용)
         self.left = None    # 왼쪽 자식 노드에 대한 포인터
         self.right = None   # 오른쪽 자식 노드에 대한 포인터
 
 class Allocator:
     """
     메모리 할당자 클래스
+
+    빈 블록은 (size, start) 순으로 정렬된 AVL 트리 하나에 모두 들어 있고,
+    시작/끝 주소 딕셔너리로 주소상 이웃한 빈 블록을 바로 찾아 병합합니다.
     """
-    def __init__(self):
+    def __init__(self, fit="best"):
         self.chunk_size = 4096  # 4KB의 chunk 크기
-        self.arena = []          # 할당된 메모리 블록을 저장하는 리스트 [(id, size)]
-        self.free_blocks_list_head = ListNode(0, 0)  # 이중 연결 리스트의 더미 헤드 노드
+        self.fit = fit           # "best" 또는 "first"
+        self.arena = {}          # 할당된 블록의 handle table: id -> (start, size)
+        self.used_memory = 0     # 할당된 블록 크기의 합
+        self.realloc_in_place = 0  # 제자리에서 끝난 realloc 수
+        self.realloc_moved = 0     # 옮겨서 복사가 필요했던 realloc 수
+        self.copied_bytes = 0      # realloc 이동으로 복사해야 했던 바이트 수
+        self.total_memory = 0    # 지금까지 확보한 chunk 들의 총 크기 (다음 chunk 의 시작 주소)
         self.free_blocks_tree = None  # 빈 블록을 저장하는 AVL 트리
+        self.free_by_start = {}  # 빈 블록 시작 주소 -> 크기
+        self.free_by_end = {}    # 빈 블록 끝 주소 -> 시작 주소
 
     def print_stats(self):
         """
         메모리 할당 통계를 출력합니다.
         """
-        total_memory = len(self.arena) * self.chunk_size
-        in_use = sum(block[1] for block in self.arena)
+        total_memory = self.total_memory
+        in_use = self.used_memory
         utilization = in_use / total_memory if total_memory != 0 else 0
 
         print("Arena: {} KB".format(total_memory // 1024))
@@ -51,6 +54,17 @@ class Allocator:
             return 0
         return node.height
 
+    def update(self, node):
+        """
+        자식 정보로부터 노드의 높이와 min_start 를 다시 계산합니다.
+        """
+        node.height = 1 + max(self.height(node.left), self.height(node.right))
+        node.min_start = node.start
+        if node.left is not None and node.left.min_start < node.min_start:
+            node.min_start = node.left.min_start
+        if node.right is not None and node.right.min_start < node.min_start:
+            node.min_start = node.right.min_start
+
     def balance_factor(self, node):
         """
         노드의 균형인수를 계산합니다.
@@ -71,8 +85,8 @@ class Allocator:
         y.left = T2
 
         # 높이 업데이트
-        y.height = max(self.height(y.left), self.height(y.right)) + 1
-        x.height = max(self.height(x.left), self.height(x.right)) + 1
+        self.update(y)
+        self.update(x)
 
         return x
 
@@ -88,129 +102,267 @@ class Allocator:
         x.right = T2
 
         # 높이 업데이트
-        x.height = max(self.height(x.left), self.height(x.right)) + 1
-        y.height = max(self.height(y.left), self.height(y.right)) + 1
+        self.update(x)
+        self.update(y)
 
         return y
 
+    def rebalance(self, root):
+        """
+        노드의 높이를 갱신하고 불균형이 있으면 회전으로 맞춥니다.
+        """
+        self.update(root)
+        balance = self.balance_factor(root)
+
+        if balance > 1:
+            if self.balance_factor(root.left) < 0:
+                root.left = self.rotate_left(root.left)
+            return self.rotate_right(root)
+        if balance < -1:
+            if self.balance_factor(root.right) > 0:
+                root.right = self.rotate_right(root.right)
+            return self.rotate_left(root)
+
+        return root
+
     def insert_into_tree(self, root, start, size):
         """
-        AVL 트리에 새로운 노드를 삽입합니다.
+        AVL 트리에 새로운 노드를 삽입합니다. 키는 (size, start) 입니다.
         """
         if root is None:
             return TreeNode(start, size)
-        
-        if start < root.start:
+
+        if (size, start) < (root.size, root.start):
             root.left = self.insert_into_tree(root.left, start, size)
         else:
             root.right = self.insert_into_tree(root.right, start, size)
 
-        # 노드의 높이 업데이트
-        root.height = 1 + max(self.height(root.left), self.height(root.right))
+        return self.rebalance(root)
 
-        # 균형인수 계산
-        balance = self.balance_factor(root)
+    def delete_from_tree(self, root, start, size):
+        """
+        AVL 트리에서 (size, start) 노드를 삭제합니다.
+        """
+        if root is None:
+            return None
 
-        # 불균형이 발생한 경우 회전 수행
-        if balance > 1:
-            if start < root.left.start:
-                return self.rotate_right(root)
-            else:
-                root.left = self.rotate_left(root.left)
-                return self.rotate_right(root)
-        if balance < -1:
-            if start > root.right.start:
-                return self.rotate_left(root)
+        key = (size, start)
+        if key < (root.size, root.start):
+            root.left = self.delete_from_tree(root.left, start, size)
+        elif key > (root.size, root.start):
+            root.right = self.delete_from_tree(root.right, start, size)
+        else:
+            if root.left is None:
+                return root.right
+            if root.right is None:
+                return root.left
+            # 오른쪽 서브트리의 최소 노드로 대체
+            successor = root.right
+            while successor.left is not None:
+                successor = successor.left
+            root.start, root.size = successor.start, successor.size
+            root.right = self.delete_from_tree(root.right, successor.start, successor.size)
+
+        return self.rebalance(root)
+
+    def find_best_fit(self, root, size):
+        """
+        요청 크기 이상인 블록 중 가장 작은 (size, start) 블록을 찾습니다.
+        """
+        best = None
+        while root is not None:
+            if root.size >= size:
+                best = root
+                root = root.left
             else:
-                root.right = self.rotate_right(root.right)
-                return self.rotate_left(root)
+                root = root.right
+        return best
 
-        return root
+    def find_first_fit(self, root, size):
+        """
+        요청 크기 이상인 블록 중 시작 주소가 가장 낮은 블록을 찾습니다.
+        root.size >= size 이면 root 와 오른쪽 서브트리 전체가 후보이므로
+        min_start 로 후보를 좁히며 한 경로만 내려갑니다.
+        """
+        best_start = None
+        while root is not None:
+            if root.size >= size:
+                if best_start is None or root.start < best_start:
+                    best_start = root.start
+                if root.right is not None and root.right.min_start < best_start:
+                    best_start = root.right.min_start
+                root = root.left
+            else:
+                root = root.right
+        return best_start
 
-    def find_block(self, root, size):
+    def find_block(self, size):
         """
-        요청 크기보다 크거나 같은 블록을 찾습니다.
+        요청 크기보다 크거나 같은 블록의 (start, size) 를 찾습니다.
         """
-        if root is None:
+        if self.fit == "first":
+            start = self.find_first_fit(self.free_blocks_tree, size)
+            if start is None:
+                return None
+            return start, self.free_by_start[start]
+        block = self.find_best_fit(self.free_blocks_tree, size)
+        if block is None:
             return None
-        
-        if root.size >= size:
-            return root
+        return block.start, block.size
 
-        if root.right is not None:
-            return self.find_block(root.right, size)
-        return self.find_block(root.left, size)
+    def add_free_block(self, start, size):
+        """
+        빈 블록을 트리와 주소 딕셔너리에 등록합니다.
+        """
+        self.free_blocks_tree = self.insert_into_tree(self.free_blocks_tree, start, size)
+        self.free_by_start[start] = size
+        self.free_by_end[start + size] = start
 
-    def malloc(self, id, size):
+    def remove_free_block(self, start, size):
         """
-        메모리를 할당합니다.
+        빈 블록을 트리와 주소 딕셔너리에서 제거합니다.
         """
-        block = self.find_block(self.free_blocks_tree, size)
+        self.free_blocks_tree = self.delete_from_tree(self.free_blocks_tree, start, size)
+        del self.free_by_start[start]
+        del self.free_by_end[start + size]
 
-        if block is not None:
-            self.arena.append((id, size))
-            if block.size > size:
-                self.free_blocks_tree = self.insert_into_tree(self.free_blocks_tree, block.start + size, block.size - size)
-        else:
-            self.arena.append((id, self.chunk_size))
+    def grow(self, size):
+        """
+        arena 끝에 size 바이트 이상을 chunk 단위로 확보합니다. (끝의 빈 블록과 병합)
+        """
+        chunks = max(1, (size + self.chunk_size - 1) // self.chunk_size)
+        self.free_block(self.total_memory, chunks * self.chunk_size)
+        self.total_memory += chunks * self.chunk_size
 
-    def insert_into_list(self, node, start, size):
+    def take_block(self, size, alignment=1):
         """
-        이중 연결 리스트에 새로운 노드를 삽입합니다.
+        빈 블록에서 alignment 배수 주소로 시작하는 size 바이트를 떼어 내고 시작 주소를 반환합니다.
+        정렬 때문에 앞에 남는 부분과 뒤에 남는 부분은 다시 빈 블록이 됩니다.
         """
-        new_node = ListNode(start, size)
-        new_node.next = node.next
-        new_node.prev = node
-        if node.next:
-            node.next.prev = new_node
-        node.next = new_node
+        need = size + alignment - 1
+        block = self.find_block(need)
+
+        if block is None:
+            # 맞는 빈 블록이 없으면 필요한 만큼 chunk 를 새로 확보
+            self.grow(need)
+            block = self.find_block(need)
+
+        start, block_size = block
+        self.remove_free_block(start, block_size)
+        aligned = (start + alignment - 1) & -alignment
+        if aligned > start:
+            self.add_free_block(start, aligned - start)
+        end = start + block_size
+        if end > aligned + size:
+            self.add_free_block(aligned + size, end - aligned - size)
+        return aligned
 
-    def merge_adjacent_free_blocks(self, node):
+    def malloc(self, id, size):
         """
-        인접한 빈 블록들을 병합합니다.
+        메모리를 할당합니다.
         """
-        # 이전 노드와 병합 (현재 노드의 시작 주소가 이전 노드의 끝 주소와 동일한지 확인)
-        if node.prev and node.prev.start + node.prev.size == node.start:
-            node.prev.size += node.size  # 이전 노드의 크기를 현재 노드의 크기만큼 증가
-            node.prev.next = node.next  # 이전 노드의 다음 포인터를 현재 노드의 다음 포인터로 설정
-            if node.next:
-                node.next.prev = node.prev  # 현재 노드의 다음 노드가 존재하면, 그 노드의 이전 포인터를 이전 노드로 설정
-            node = node.prev  # 현재 노드를 병합된 이전 노드로 업데이트
+        start = self.take_block(size)
+        self.arena[id] = (start, size)
+        self.used_memory += size
+        return start
 
-        # 다음 노드와 병합 (현재 노드의 끝 주소가 다음 노드의 시작 주소와 동일한지 확인)
-        if node.next and node.start + node.size == node.next.start:
-            node.size += node.next.size  # 현재 노드의 크기를 다음 노드의 크기만큼 증가
-            node.next = node.next.next  # 현재 노드의 다음 포인터를 다음 노드의 다음 포인터로 설정
-            if node.next:
-                node.next.prev = node  # 다음 노드의 다음 노드가 존재하면, 그 노드의 이전 포인터를 현재 노드로 설정
+    def aligned_alloc(self, id, size, alignment):
+        """
+        시작 주소가 alignment(2의 거듭제곱) 배수인 블록을 할당합니다.
+        """
+        if alignment <= 0 or alignment & (alignment - 1):
+            raise ValueError("alignment must be a power of two")
+        start = self.take_block(size, alignment)
+        self.arena[id] = (start, size)
+        self.used_memory += size
+        return start
+
+    def realloc(self, id, size):
+        """
+        블록 크기를 바꾸고 (새) 시작 주소를 반환합니다.
+        - 줄일 때: 뒷부분을 잘라 빈 블록으로 돌려줍니다.
+        - 늘릴 때: 바로 뒤 빈 블록(arena 끝이면 새 chunk 포함)으로 제자리에서 늘립니다.
+        - 그래도 모자라면 먼저 해제한 뒤 새 자리를 잡습니다. 새 자리는 원래 자리와 겹칠 수 있으므로
+          내용은 memmove 처럼 옮겨야 합니다.
+        """
+        if id not in self.arena:
+            return self.malloc(id, size)
+        start, old_size = self.arena[id]
+        end = start + old_size
+        if size <= old_size:
+            if size < old_size:
+                self.free_block(start + size, old_size - size)
+            self.realloc_in_place += 1
+        else:
+            need = size - old_size
+            next_size = self.free_by_start.get(end, 0)
+            if next_size < need and end + next_size == self.total_memory:
+                self.grow(need - next_size)
+                next_size = self.free_by_start[end]
+            if next_size >= need:
+                self.remove_free_block(end, next_size)
+                if next_size > need:
+                    self.add_free_block(start + size, next_size - need)
+                self.realloc_in_place += 1
+            else:
+                self.free_block(start, old_size)
+                start = self.take_block(size)
+                self.realloc_moved += 1
+                self.copied_bytes += old_size
+        self.arena[id] = (start, size)
+        self.used_memory += size - old_size
+        return start
+
+    def free_block(self, start, size):
+        """
+        빈 블록을 주소상 앞뒤 빈 블록과 병합한 뒤 등록합니다.
+        크기 0 구간은 다른 블록과 시작 주소가 겹칠 수 있어 등록하지 않습니다. (malloc(id, 0) 의 해제)
+        """
+        if size == 0:
+            return
+        prev_start = self.free_by_end.get(start)
+        if prev_start is not None:
+            prev_size = self.free_by_start[prev_start]
+            self.remove_free_block(prev_start, prev_size)
+            start, size = prev_start, prev_size + size
+        next_size = self.free_by_start.get(start + size)
+        if next_size is not None:
+            self.remove_free_block(start + size, next_size)
+            size += next_size
+        self.add_free_block(start, size)
 
     def free(self, id):
         """
         메모리를 해제합니다.
         """
-        for i, (block_id, size) in enumerate(self.arena):
-            if block_id == id:
-                # 해제된 블록을 이중 연결 리스트에 삽입
-                self.insert_into_list(self.free_blocks_list_head, i * self.chunk_size, size)
-                # 삽입된 노드와 인접한 빈 블록들을 병합
-                self.merge_adjacent_free_blocks(self.free_blocks_list_head.next)
-                del self.arena[i]  # 해제된 블록을 arena에서 삭제
-                break
+        block = self.arena.pop(id, None)  # 해제된 블록을 handle table에서 삭제
+        if block is None:
+            return
+        start, size = block
+        self.used_memory -= size
+        self.free_block(start, size)
 
 if __name__ == "__main__":
-    allocator = Allocator()
+    import os
+    import sys
+    # 요청은 team_project/alloc_trace 로 읽어 .atrc 캐시를 재사용한다
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+    from alloc_trace import iter_requests
 
-    with open("./input.txt", "r") as file:
-        start_time = time.time()
-        for line in file:
-            req = line.split()
-            if req[0] == 'a':
-                allocator.malloc(int(req[1]), int(req[2]))
-            elif req[0] ==  'f':
-                allocator.free(int(req[1]))
-
-        end_time = time.time()
-        execution_time = end_time - start_time
+    allocator = Allocator()
+    path = sys.argv[1] if len(sys.argv) > 1 else "./input.txt"
+
+    start_time = time.time()
+    for op, id, size in iter_requests(path):
+        if op == 'a':
+            allocator.malloc(id, size)
+        elif op == 'f':
+            allocator.free(id)
+        elif op == 'r':
+            allocator.realloc(id, size)
+
+    end_time = time.time()
+    execution_time = end_time - start_time
 
     allocator.print_stats()  # 통계 출력
     print("Execution Time:", execution_time)  # 실행 시간 출력
@@ -1,19 +1,47 @@
+SL_BITS = 3  # 2의 거듭제곱 구간 하나를 2^SL_BITS 개의 크기 클래스로 나눈다
+SCAN_LIMIT = 8  # 요청 크기와 같은 클래스에서 확인할 최대 블록 수
+
 class Node:
+    __slots__ = ("id", "start", "size", "free", "prev", "next", "fprev", "fnext")
+
     # 노드 클래스 초기화 : 메모리 블록을 나타낸다.
     def __init__(self, id, start, size, free=True):
         self.id = id # 블록 식별자
         self.start = start # 블록 시작 주소
         self.size = size # 블록 크기
         self.free = free # 사용 가능 여부
-        self.next = None # 다음 노드에 대한 링크
+        self.prev = None # 주소상 이전 노드에 대한 링크
+        self.next = None # 주소상 다음 노드에 대한 링크
+        self.fprev = None # 같은 크기 클래스의 free list 이전 노드
+        self.fnext = None # 같은 크기 클래스의 free list 다음 노드
+
+# 크기가 속한 클래스 번호 (클래스의 하한이 size 이하인 가장 큰 클래스)
+def class_index(size):
+    fl = size.bit_length() - 1
+    if fl < SL_BITS:
+        return size
+    sl = (size >> (fl - SL_BITS)) & ((1 << SL_BITS) - 1)
+    return ((fl - SL_BITS + 1) << SL_BITS) | sl
+
+# 요청 크기를 다음 클래스 경계로 올림: 이 클래스 이상의 블록은 모두 요청을 만족한다
+def search_index(size):
+    fl = size.bit_length() - 1
+    if fl >= SL_BITS:
+        size += (1 << (fl - SL_BITS)) - 1
+    return class_index(size)
 
 class Allocator:
     # 할당기 클래스 초기화
-    def __init__(self): # 메모리 리스트의 시작 노드
+    def __init__(self, verbose=True): # 메모리 리스트의 시작 노드
         self.head = None # 전체 할당된 메모리의 양
+        self.tail = None # 주소가 가장 높은 노드
         self.total_memory = 0 # 사용중인 메모리 양
         self.used_memory = 0 # 사용 중인 메모리 양
         self.allocations = {}  # 할당된 메모리 블록을 ID로 관리
+        self.blocks = {}  # 시작 주소 -> 노드
+        self.free_heads = {}  # 크기 클래스 -> free list 첫 노드
+        self.bitmap = 0  # 비어 있지 않은 크기 클래스의 비트맵
+        self.verbose = verbose # 요청마다 메시지 출력 여부
 
     # 메모리 사용 통계 출력
     def print_stats(self):
@@ -22,77 +50,163 @@ class Allocator:
         utilization = (self.used_memory / self.total_memory) * 100 if self.total_memory > 0 else 0
         print("Utilization: {:.2f}%".format(utilization))
 
+    # 자유 블록을 크기 클래스의 free list 앞에 넣는다
+    def _push_free(self, node):
+        idx = class_index(node.size)
+        head = self.free_heads.get(idx)
+        node.free = True
+        node.fprev = None
+        node.fnext = head
+        if head:
+            head.fprev = node
+        self.free_heads[idx] = node
+        self.bitmap |= 1 << idx
+
+    # 자유 블록을 free list 에서 뺀다
+    def _remove_free(self, node):
+        idx = class_index(node.size)
+        if node.fprev:
+            node.fprev.fnext = node.fnext
+        else:
+            self.free_heads[idx] = node.fnext
+            if not node.fnext:
+                del self.free_heads[idx]
+                self.bitmap &= ~(1 << idx)
+        if node.fnext:
+            node.fnext.fprev = node.fprev
+        node.fprev = node.fnext = None
+        node.free = False
+
+    # 요청 크기를 만족하는 블록 찾기
+    # 요청 크기가 속한 클래스에서 앞쪽 몇 개만 확인하고, 없으면 비트맵으로 O(1) 에 다음 클래스를 찾는다
+    def _find_free(self, size):
+        node = self.free_heads.get(class_index(size))
+        for _ in range(SCAN_LIMIT):
+            if not node:
+                break
+            if node.size >= size:
+                return node
+            node = node.fnext
+        idx = search_index(size)
+        mask = self.bitmap >> idx
+        if mask == 0:
+            return None
+        idx += (mask & -mask).bit_length() - 1
+        return self.free_heads[idx]
+
+    # node 뒤에 new_node 를 주소 순서대로 연결
+    def _link_after(self, node, new_node):
+        new_node.prev = node
+        new_node.next = node.next if node else self.head
+        if new_node.next:
+            new_node.next.prev = new_node
+        else:
+            self.tail = new_node
+        if node:
+            node.next = new_node
+        else:
+            self.head = new_node
+
+    # node 를 주소 리스트에서 뺀다
+    def _unlink(self, node):
+        if node.prev:
+            node.prev.next = node.next
+        else:
+            self.head = node.next
+        if node.next:
+            node.next.prev = node.prev
+        else:
+            self.tail = node.prev
+        del self.blocks[node.start]
+
     # 메모리 할당 함수
     def malloc(self, id, size):
-        print(f"Allocating {size} bytes for ID {id}...")
-        current = self.head
-        prev = None
-        while current:
-            if current.free and current.size >= size:
-                if current.size == size:
-                    current.free = False
-                    self.used_memory += size
-                    self.allocations[id] = current.start
-                    print(f"Allocated at {current.start} (exact fit).")
-                    return current.start
-                else:
-                    new_node = Node(id, current.start, size, False)
-                    new_node.next = current
-                    if prev:
-                        prev.next = new_node
-                    else:
-                        self.head = new_node
-                    current.start += size
-                    current.size -= size
-                    self.used_memory += size
-                    self.allocations[id] = new_node.start
-                    print(f"Allocated at {new_node.start} (split block).")
-                    return new_node.start
-            prev = current
-            current = current.next
-            
+        if self.verbose:
+            print(f"Allocating {size} bytes for ID {id}...")
+        # 크기 0 블록은 뒤 블록과 시작 주소가 같아져 blocks 에서 덮어쓰이므로 최소 1바이트로 잡는다
+        size = max(size, 1)
+        current = self._find_free(size)
+        if current:
+            self._remove_free(current)
+        elif self.tail and self.tail.free:
+            # 끝 블록이 비어 있으면 모자란 만큼만 arena 를 늘려서 사용
+            current = self.tail
+            self._remove_free(current)
+            self.total_memory += size - current.size
+            current.size = size
+        if current:
+            if current.size > size:
+                # 앞쪽을 할당하고 남은 뒤쪽은 다시 free list 로
+                rest = Node(None, current.start + size, current.size - size)
+                current.size = size
+                self._link_after(current, rest)
+                self.blocks[rest.start] = rest
+                self._push_free(rest)
+                if self.verbose:
+                    print(f"Allocated at {current.start} (split block).")
+            elif self.verbose:
+                print(f"Allocated at {current.start} (exact fit).")
+            current.id = id
+            self.used_memory += size
+            self.allocations[id] = current.start
+            return current.start
+
         # 적합한 블록이 없을 경우 새로운 블록을 할당
         new_start = self.total_memory
         new_node = Node(id, new_start, size, False)
-        if prev:
-            prev.next = new_node
-        else:
-            self.head = new_node
+        self._link_after(self.tail, new_node)
+        self.blocks[new_start] = new_node
         self.total_memory += size
         self.used_memory += size
         self.allocations[id] = new_start
-        print(f"Allocated at new start {new_start}.")
+        if self.verbose:
+            print(f"Allocated at new start {new_start}.")
         return new_start
 
     # 메모리 해제 함수
     def free(self, id):
-        print(f"Freeing memory for ID {id}...")
+        if self.verbose:
+            print(f"Freeing memory for ID {id}...")
         if id in self.allocations:
-            addr = self.allocations[id]
-            current = self.head
-            while current:
-                if current.start == addr and not current.free:
-                    current.free = True
-                    self.used_memory -= current.size
-                    del self.allocations[id]
-                    print(f"Freed memory at address {addr}.")
-                    return
-                current = current.next
+            addr = self.allocations.pop(id)
+            current = self.blocks[addr]
+            self.used_memory -= current.size
+            current.id = None
+            # 주소상 이웃한 자유 블록과 바로 병합
+            if current.next and current.next.free:
+                neighbor = current.next
+                self._remove_free(neighbor)
+                self._unlink(neighbor)
+                current.size += neighbor.size
+            if current.prev and current.prev.free:
+                neighbor = current.prev
+                self._remove_free(neighbor)
+                self._unlink(current)
+                neighbor.size += current.size
+                current = neighbor
+            self._push_free(current)
+            if self.verbose:
+                print(f"Freed memory at address {addr}.")
+            return
         print("Error: Address not found or already free for ID", id)
 
 # 메인 실행 부분
 if __name__ == "__main__":
+    import os
+    import sys
+    # 요청은 team_project/alloc_trace 로 읽어 .atrc 캐시를 재사용한다
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+    from alloc_trace import iter_requests
+
     allocator = Allocator()
-    file_path = "/Users/imin-yeong/Documents/2024/자료구조/팀플/input.txt"
+    file_path = sys.argv[1] if len(sys.argv) > 1 else "/Users/imin-yeong/Documents/2024/자료구조/팀플/input.txt"
 
     # 입력 파일 처리
-    with open(file_path, "r") as file:
-        for line in file:
-            req = line.split()
-            if req[0] == 'a': # 할당 요청 처리
-                allocator.malloc(int(req[1]), int(req[2]))
-            elif req[0] == 'f': # 해제 요청 처리
-                allocator.free(int(req[1]))
+    for op, id, size in iter_requests(file_path):
+        if op == 'a': # 할당 요청 처리
+            allocator.malloc(id, size)
+        elif op == 'f': # 해제 요청 처리
+            allocator.free(id)
     
     # 최종 메모리 상태 출력
     allocator.print_stats()
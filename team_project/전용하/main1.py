@@ -1,68 +1,267 @@
 import time
+from array import array
+
+WORD_BITS = 64
+FULL_WORD = (1 << WORD_BITS) - 1
+
+def word_runs(x):
+    # 64비트 워드 x 에서 (아래쪽 끝의 빈 청크 수, 위쪽 끝의 빈 청크 수, 가장 긴 빈 구간 길이)
+    if x == FULL_WORD:
+        return WORD_BITS, WORD_BITS, WORD_BITS
+    if not x:
+        return 0, 0, 0
+    pre = (x ^ (x + 1)).bit_length() - 1
+    suf = WORD_BITS - (~x & FULL_WORD).bit_length()
+    # masks[k] 의 비트 i 는 i 부터 2^k 개가 모두 비어 있을 때만 남는다. 큰 단계부터 붙여 가며 길이를 잰다
+    masks = [x]
+    while masks[-1]:
+        step = 1 << (len(masks) - 1)
+        masks.append(masks[-1] & (masks[-1] >> step))
+    best = 1 << (len(masks) - 2)
+    cur = masks[-2]
+    for k in range(len(masks) - 3, -1, -1):
+        m = cur & (masks[k] >> best)
+        if m:
+            cur = m
+            best += 1 << k
+    return pre, suf, best
+
 class Allocator:
-    def __init__(self):
+    def __init__(self, contiguous=True):
         self.chunk_size = 4096  # 4KB
-        self.arena = []
-        self.allocations = {}  # 각 ID에 할당된 청크를 추적하는 딕셔너리
-        self.free_chunks = {}  # 해제된 청크를 관리하는 딕셔너리 (키: 청크 인덱스, 값: True)
+        self.total_chunks = 0  # arena 에 확보한 청크 수
+        self.allocations = {}  # 각 ID에 할당된 청크 구간 [(시작 청크, 개수), ...]
+        self.words = array('Q')  # 청크 비트맵 (1 = 비어 있음), 64청크당 한 워드
+        self.summary = 0  # 워드 비트맵: i 번째 비트가 1 이면 words[i] 에 빈 청크가 있음
+        # 워드 위의 세그먼트 트리 (1 번이 루트, leaves 번부터 워드). 노드마다 그 구간의
+        # 앞쪽/뒤쪽 끝에서 이어지는 빈 청크 수와 가장 긴 빈 구간 길이를 들고 있어
+        # 워드 경계를 넘는 구간까지 가장 낮은 주소의 연속 구간을 O(log 워드 수) 에 찾는다
+        self.leaves = 0
+        self.run_pre = array('i')
+        self.run_suf = array('i')
+        self.run_best = array('i')
+        self.stale_words = set()  # 비트가 바뀌었지만 트리에 아직 반영하지 않은 워드 (청크 하나짜리 요청은 트리를 안 쓴다)
+        self.contiguous = contiguous  # False 면 연속 구간이 없을 때 흩어진 빈 청크로 채움
 
     def print_stats(self):
-        total_chunks = len(self.arena)
-        allocated_chunks = sum(len(chunks) for chunks in self.allocations.values())
-        arena_size = total_chunks * self.chunk_size / (1024 * 1024)  # MB
+        allocated_chunks = sum(count for runs in self.allocations.values() for _, count in runs)
+        arena_size = self.total_chunks * self.chunk_size / (1024 * 1024)  # MB
         in_use_size = allocated_chunks * self.chunk_size / (1024 * 1024)  # MB
         utilization = in_use_size / arena_size if arena_size > 0 else 0
+        contiguous = sum(1 for runs in self.allocations.values() if len(runs) == 1)
         print(f"Arena: {arena_size:.2f} MB")
         print(f"In-use: {in_use_size:.2f} MB")
         print(f"Utilization: {utilization:.2f}")
+        print(f"Contiguous allocations: {contiguous}/{len(self.allocations)}")
 
-    def hash_function(self, index):
-        return index  # 간단한 해시 함수: 청크 인덱스를 그대로 반환
+    def _mark(self, start, count, free):
+        # [start, start + count) 청크의 비트를 워드 단위 마스크로 한 번에 바꾼다
+        end = start + count
+        while start < end:
+            w = start // WORD_BITS
+            lo = start % WORD_BITS
+            hi = min(WORD_BITS, lo + end - start)
+            mask = (FULL_WORD >> (WORD_BITS - (hi - lo))) << lo
+            if free:
+                self.words[w] |= mask
+                self.summary |= 1 << w
+            else:
+                self.words[w] &= ~mask & FULL_WORD
+                if self.words[w] == 0:
+                    self.summary &= ~(1 << w)
+            self.stale_words.add(w)
+            start += hi - lo
 
-    def malloc(self, id, size):
-        chunks_needed = (size + self.chunk_size - 1) // self.chunk_size
-        allocated_chunks = []
+    def _update_runs(self, w):
+        # words[w] 가 바뀌면 그 잎부터 루트까지 구간 정보를 다시 계산 (값이 그대로면 멈춤)
+        pre, suf, best = self.run_pre, self.run_suf, self.run_best
+        i = self.leaves + w
+        pre[i], suf[i], best[i] = word_runs(self.words[w])
+        half = WORD_BITS
+        i >>= 1
+        while i:
+            l = i + i
+            r = l + 1
+            pl, pr, sl, sr = pre[l], pre[r], suf[l], suf[r]
+            p = pl if pl < half else pl + pr
+            s = sr if sr < half else sr + sl
+            b = sl + pr
+            if best[l] > b:
+                b = best[l]
+            if best[r] > b:
+                b = best[r]
+            if p == pre[i] and s == suf[i] and b == best[i]:
+                break
+            pre[i], suf[i], best[i] = p, s, b
+            half *= 2
+            i >>= 1
+
+    def _build_runs(self):
+        # 워드 수가 잎 수를 넘으면 잎을 두 배로 늘려 트리를 처음부터 다시 만든다
+        leaves = max(1, self.leaves)
+        while leaves < len(self.words):
+            leaves *= 2
+        self.leaves = leaves
+        self.run_pre = array('i', bytes(4 * 2 * leaves))
+        self.run_suf = array('i', bytes(4 * 2 * leaves))
+        self.run_best = array('i', bytes(4 * 2 * leaves))
+        self.stale_words.clear()
+        pre, suf, best = self.run_pre, self.run_suf, self.run_best
+        for w, x in enumerate(self.words):
+            if x:
+                pre[leaves + w], suf[leaves + w], best[leaves + w] = word_runs(x)
+        half = WORD_BITS
+        level = leaves
+        while level > 1:
+            for i in range(level // 2, level):
+                l = 2 * i
+                r = l + 1
+                pre[i] = pre[l] if pre[l] < half else half + pre[r]
+                suf[i] = suf[r] if suf[r] < half else half + suf[l]
+                best[i] = max(best[l], best[r], suf[l] + pre[r])
+            half *= 2
+            level //= 2
+
+    def _grow(self, count):
+        # arena 끝에 청크 count 개를 추가 (사용 중 상태로)
+        start = self.total_chunks
+        self.total_chunks += count
+        while len(self.words) * WORD_BITS < self.total_chunks:
+            self.words.append(0)
+        if len(self.words) > self.leaves:
+            self._build_runs()
+        return start
+
+    def _find_run(self, count):
+        # 빈 청크가 count 개 연속된 가장 낮은 주소의 구간을 찾는다
+        summary = self.summary
+        if not summary:
+            return None
+        if count == 1:
+            # 청크 하나는 가장 낮은 빈 워드의 가장 낮은 빈 비트
+            w = (summary & -summary).bit_length() - 1
+            x = self.words[w]
+            return w * WORD_BITS + (x & -x).bit_length() - 1
+        for w in self.stale_words:
+            self._update_runs(w)
+        self.stale_words.clear()
+        pre, suf, best = self.run_pre, self.run_suf, self.run_best
+        if best[1] >= count:
+            # 왼쪽 서브 트리 안, 두 서브 트리에 걸친 구간, 오른쪽 서브 트리 순으로 보면 가장 낮은 주소가 나온다
+            i = 1
+            offset = 0
+            half = self.leaves * WORD_BITS // 2
+            while i < self.leaves:
+                l = 2 * i
+                if best[l] >= count:
+                    i = l
+                elif suf[l] + pre[l + 1] >= count:
+                    return offset + half - suf[l]
+                else:
+                    i = l + 1
+                    offset += half
+                half //= 2
+            # 워드 하나 안의 구간: shift-and 를 O(log count) 번 적용하면 비트 i 는
+            # i 부터 count 개가 모두 비어 있을 때만 남는다
+            m = self.words[i - self.leaves]
+            width = 1
+            while width < count:
+                step = width if width + width <= count else count - width
+                m &= m >> step
+                width += step
+            return offset + (m & -m).bit_length() - 1
+        # 빈 구간이 arena 끝까지 이어지면 모자란 만큼만 늘려서 쓴다
+        tail = self._tail_free()
+        if tail:
+            return self.total_chunks - tail
+        return None
 
-        # 해제된 청크 중에서 할당할 청크를 찾기 위해 해시 테이블을 사용
-        for chunk_index in list(self.free_chunks.keys()):
-            if chunks_needed == 0:
+    def _tail_free(self):
+        # arena 끝에서부터 거꾸로 이어지는 빈 청크 수
+        tail = 0
+        end = self.total_chunks
+        while end > 0:
+            w = (end - 1) // WORD_BITS
+            valid = end - w * WORD_BITS
+            x = (self.words[w] << (WORD_BITS - valid)) & FULL_WORD
+            ones = WORD_BITS - (~x & FULL_WORD).bit_length()
+            tail += ones
+            if ones < valid:
                 break
-            allocated_chunks.append(chunk_index)
-            del self.free_chunks[chunk_index]  # 사용한 청크를 해제 목록에서 제거
-            chunks_needed -= 1
+            end -= valid
+        return tail
+
+    def _take_scattered(self, count):
+        # 주소가 낮은 빈 청크부터 구간 단위로 모은다 (contiguous=False 일 때만)
+        runs = []
+        while count > 0 and self.summary:
+            w = (self.summary & -self.summary).bit_length() - 1
+            x = self.words[w]
+            lo = (x & -x).bit_length() - 1
+            length = 1
+            while lo + length < WORD_BITS and length < count and (x >> (lo + length)) & 1:
+                length += 1
+            start = w * WORD_BITS + lo
+            self._mark(start, length, False)
+            if runs and runs[-1][0] + runs[-1][1] == start:
+                runs[-1] = (runs[-1][0], runs[-1][1] + length)
+            else:
+                runs.append((start, length))
+            count -= length
+        return runs, count
+
+    def malloc(self, id, size):
+        chunks_needed = max(1, (size + self.chunk_size - 1) // self.chunk_size)
+
+        start = self._find_run(chunks_needed)
+        if start is not None:
+            available = min(chunks_needed, self.total_chunks - start)
+            self._mark(start, available, False)
+            if available < chunks_needed:
+                self._grow(chunks_needed - available)
+            self.allocations[id] = [(start, chunks_needed)]
+            return
+
+        runs = []
+        if not self.contiguous:
+            runs, chunks_needed = self._take_scattered(chunks_needed)
 
         # 추가 청크가 필요한 경우 새로운 청크를 arena에 추가
-        while chunks_needed > 0:
-            chunk = len(self.arena)
-            self.arena.append(chunk)
-            allocated_chunks.append(chunk)
-            chunks_needed -= 1
+        if chunks_needed > 0:
+            start = self._grow(chunks_needed)
+            if runs and runs[-1][0] + runs[-1][1] == start:
+                runs[-1] = (runs[-1][0], runs[-1][1] + chunks_needed)
+            else:
+                runs.append((start, chunks_needed))
 
-        self.allocations[id] = allocated_chunks
+        self.allocations[id] = runs
 
     def free(self, id):
         if id in self.allocations:
-            freed_chunks = self.allocations.pop(id)
-            for chunk in freed_chunks:
-                hashed_chunk = self.hash_function(chunk)
-                self.free_chunks[hashed_chunk] = True  # 해제된 청크를 free_chunks 딕셔너리에 추가
+            for start, count in self.allocations.pop(id):
+                self._mark(start, count, True)  # 해제된 청크를 비트맵에 표시
 
 if __name__ == "__main__":
+    import os
+    import sys
+    # 요청은 team_project/alloc_trace 로 읽어 .atrc 캐시를 재사용한다
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+    from alloc_trace import iter_requests
+
+    path = sys.argv[1] if len(sys.argv) > 1 else os.path.join("Memory", "input.txt")
     start = time.time()
     allocator = Allocator()
 
-    with open("Memory\input.txt", "r") as file:
-        n = 0
-        for line in file:
-            req = line.split()
-            if req[0] == 'a':
-                allocator.malloc(int(req[1]), int(req[2]))
-            elif req[0] == 'f':
-                allocator.free(int(req[1]))
-
-            # if n % 100 == 0:
-            #     print(n, "...")
-            
-            n += 1
+    n = 0
+    for op, id, size in iter_requests(path):
+        if op == 'a':
+            allocator.malloc(id, size)
+        elif op == 'f':
+            allocator.free(id)
+
+        # if n % 100 == 0:
+        #     print(n, "...")
+
+        n += 1
     print(f"{time.time()-start:.4f} sec")
     allocator.print_stats()
@@ -1,55 +1,191 @@
 import time
 import math
+import random
+
+BUCKET_SLOTS = 4  # 버킷 하나에 들어가는 키 수 (4-way)
+STASH_SIZE = 8  # 자리를 못 찾은 키를 잠시 두는 보조 공간 크기
+MAX_LOAD = 0.95  # 이 적재율을 넘으면 테이블을 두 배로 늘린다
+MIGRATE_STEP = 8  # 연산 한 번마다 옮기는 이전 테이블 버킷 수
+MASK64 = (1 << 64) - 1
+EMPTY = None
+
+def mix64(x):
+    # splitmix64 마무리 함수: 정수 키의 비트를 고르게 섞는다
+    x = ((x ^ (x >> 30)) * 0xBF58476D1CE4E5B9) & MASK64
+    x = ((x ^ (x >> 27)) * 0x94D049BB133111EB) & MASK64
+    return x ^ (x >> 31)
 
 class CuckooHash:
-    def __init__(self, size):
-        self.size = size
+    def __init__(self, size, seed=None):
+        rng = random.Random(seed)
+        self.seed1 = rng.getrandbits(64)  # 서로 독립인 두 해시 함수의 시드
+        self.seed2 = rng.getrandbits(64)
+        self.rng = rng
         self.chunk_size = 16 * 1024  # 16KB
-        self.table1 = [None] * self.size
-        self.table2 = [None] * self.size
-        self.hash1 = lambda x: hash(x) % self.size
-        self.hash2 = lambda x: (hash(x) // self.size) % self.size
-        self.memory_size = self.size * self.chunk_size * 2  # 두 개의 테이블, 각각의 키에 16KB 할당
+        self.buckets = 1
+        while self.buckets * BUCKET_SLOTS < size:
+            self.buckets *= 2
+        self.table = [EMPTY] * (self.buckets * BUCKET_SLOTS)
+        self.stash = []
+        self.count = 0  # 테이블(이전 테이블 포함)과 stash 에 있는 키 수
+        self.old_table = None  # 점진적 resize 중인 이전 테이블
+        self.old_buckets = 0
+        self.migrate_pos = 0
         self.used_memory = 0
 
+    @property
+    def size(self):
+        return len(self.table)
+
+    @property
+    def memory_size(self):
+        old = len(self.old_table) if self.old_table is not None else 0
+        return (len(self.table) + old) * self.chunk_size  # 키마다 16KB 할당
+
+    def _hash(self, key, seed):
+        if not isinstance(key, int):
+            key = hash(key)
+        return mix64((key ^ seed) & MASK64)
+
+    def _bucket_pair(self, key, buckets):
+        mask = buckets - 1
+        return self._hash(key, self.seed1) & mask, self._hash(key, self.seed2) & mask
+
+    def _find(self, table, buckets, key):
+        # 키가 있는 슬롯 번호 (없으면 -1)
+        b1, b2 = self._bucket_pair(key, buckets)
+        for b in (b1, b2):
+            base = b * BUCKET_SLOTS
+            for i in range(base, base + BUCKET_SLOTS):
+                if table[i] == key:
+                    return i
+        return -1
+
+    def _place(self, key):
+        """
+        키를 현재 테이블에 넣는다. 두 버킷이 모두 차 있으면 최대 log n 번까지
+        무작위 키를 밀어내고, 그래도 자리가 없으면 stash 에 둔다.
+        성공하면 None, stash 도 가득 차면 자리를 못 찾은 키를 반환한다.
+        """
+        table = self.table
+        b1, b2 = self._bucket_pair(key, self.buckets)
+        for b in (b1, b2):
+            base = b * BUCKET_SLOTS
+            for i in range(base, base + BUCKET_SLOTS):
+                if table[i] is EMPTY:
+                    table[i] = key
+                    return None
+        max_kicks = max(8, 2 * int(math.log2(len(table))))
+        b = b1 if self.rng.getrandbits(1) else b2
+        for _ in range(max_kicks):
+            # 버킷 안의 키들 중 다른 쪽 버킷에 빈 자리가 있는 키가 있으면 그 키를 옮기고 끝낸다
+            base = b * BUCKET_SLOTS
+            for i in range(base, base + BUCKET_SLOTS):
+                c1, c2 = self._bucket_pair(table[i], self.buckets)
+                alt = (c2 if c1 == b else c1) * BUCKET_SLOTS
+                for j in range(alt, alt + BUCKET_SLOTS):
+                    if table[j] is EMPTY:
+                        table[j] = table[i]
+                        table[i] = key
+                        return None
+            # 없으면 무작위 키 하나를 밀어내고 그 키의 다른 버킷으로 이동
+            i = base + self.rng.randrange(BUCKET_SLOTS)
+            key, table[i] = table[i], key
+            c1, c2 = self._bucket_pair(key, self.buckets)
+            b = c2 if c1 == b else c1
+            base = b * BUCKET_SLOTS
+            for i in range(base, base + BUCKET_SLOTS):
+                if table[i] is EMPTY:
+                    table[i] = key
+                    return None
+        if len(self.stash) < STASH_SIZE:
+            self.stash.append(key)
+            return None
+        return key
+
+    def _start_resize(self):
+        # 이전 테이블은 그대로 두고 두 배 크기의 새 테이블로 조금씩 옮긴다
+        if self.old_table is not None:
+            table = self.table
+            self._migrate(self.old_buckets)
+            if self.table is not table:
+                # 남은 키를 옮기다가 안쪽에서 이미 resize 되었다. 테이블은 이미 늘었고
+                # 지금의 old_table 은 아직 옮기는 중이므로 덮어쓰지 않고 돌아간다
+                return
+        self.old_table, self.old_buckets = self.table, self.buckets
+        self.buckets *= 2
+        self.table = [EMPTY] * (self.buckets * BUCKET_SLOTS)
+        self.migrate_pos = 0
+
+    def _migrate(self, steps):
+        old = self.old_table
+        while steps > 0 and self.migrate_pos < self.old_buckets:
+            base = self.migrate_pos * BUCKET_SLOTS
+            for i in range(base, base + BUCKET_SLOTS):
+                key = old[i]
+                if key is not EMPTY:
+                    old[i] = EMPTY
+                    self._insert_key(key)
+                    if self.old_table is not old:
+                        # 옮기는 도중 다시 resize 되었으면 old 는 이미 모두 옮겨졌다
+                        return
+            self.migrate_pos += 1
+            steps -= 1
+        if self.migrate_pos >= self.old_buckets:
+            self.old_table = None
+            self.old_buckets = 0
+            # stash 에 있던 키들은 넓어진 테이블에 다시 넣어 본다
+            stash, self.stash = self.stash, []
+            for key in stash:
+                self._insert_key(key)
+
+    def _insert_key(self, key):
+        key = self._place(key)
+        while key is not None:
+            # stash 까지 가득 찼으면 테이블을 늘리고 밀려난 키를 다시 넣는다
+            self._start_resize()
+            key = self._place(key)
+
     def insert(self, key):
         if self.search(key):
             print(f"Error: Key {key} already exists.")
             return False
-
-        for _ in range(self.size):
-            pos1 = self.hash1(key)
-            if self.table1[pos1] is None:
-                self.table1[pos1] = key
-                self.used_memory += self.chunk_size
-                return True
-            key, self.table1[pos1] = self.table1[pos1], key
-
-            pos2 = self.hash2(key)
-            if self.table2[pos2] is None:
-                self.table2[pos2] = key
-                self.used_memory += self.chunk_size
-                return True
-            key, self.table2[pos2] = self.table2[pos2], key
-
-        print("Error: Hash table is full or loop detected")
-        return False
+        if self.old_table is not None:
+            self._migrate(MIGRATE_STEP)
+        elif self.count + 1 > MAX_LOAD * len(self.table):
+            self._start_resize()
+        self._insert_key(key)
+        self.count += 1
+        self.used_memory += self.chunk_size
+        return True
 
     def search(self, key):
-        return key == self.table1[self.hash1(key)] or key == self.table2[self.hash2(key)]
+        if self._find(self.table, self.buckets, key) >= 0 or key in self.stash:
+            return True
+        return self.old_table is not None and self._find(self.old_table, self.old_buckets, key) >= 0
 
     def delete(self, key):
-        pos1 = self.hash1(key)
-        if self.table1[pos1] == key:
-            self.table1[pos1] = None
-            self.used_memory -= self.chunk_size
-            return True
-        pos2 = self.hash2(key)
-        if self.table2[pos2] == key:
-            self.table2[pos2] = None
-            self.used_memory -= self.chunk_size
-            return True
-        return False
+        i = self._find(self.table, self.buckets, key)
+        if i >= 0:
+            self.table[i] = EMPTY
+        elif key in self.stash:
+            self.stash.remove(key)
+        elif self.old_table is not None and (i := self._find(self.old_table, self.old_buckets, key)) >= 0:
+            self.old_table[i] = EMPTY
+        else:
+            return False
+        self.count -= 1
+        self.used_memory -= self.chunk_size
+        if self.old_table is not None:
+            self._migrate(MIGRATE_STEP)
+        return True
+
+    # 다른 할당기와 같은 malloc(id, size) / free(id) 인터페이스: 키 하나가 16KB 블록 하나
+    def malloc(self, id, size):
+        return self.insert(id)
+
+    def free(self, id):
+        return self.delete(id)
 
     def print_stats(self, start_time):
         end_time = time.time()
@@ -63,17 +199,20 @@ class CuckooHash:
         print(f"Time taken: {time_taken:.2f} seconds")
 
 if __name__ == "__main__":
+    import os
+    import sys
+    # 요청은 team_project/alloc_trace 로 읽어 .atrc 캐시를 재사용한다
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+    from alloc_trace import iter_requests
+
     start_time = time.time()
     cuckoo = CuckooHash(131072)  # 큰 해시 테이블
 
-    path = "/Users/jeongjaeung/Desktop/soongsil/ds_2024/assignment04/input.txt"
-    with open(path, "r") as file:
-        for line in file:
-            parts = line.strip().split()
-            cmd, key = parts[0], int(parts[1])
-            if cmd == 'a':
-                cuckoo.insert(key)
-            elif cmd == 'd':
-                cuckoo.delete(key)
+    path = sys.argv[1] if len(sys.argv) > 1 else "/Users/jeongjaeung/Desktop/soongsil/ds_2024/assignment04/input.txt"
+    for cmd, key, _ in iter_requests(path):  # d 요청은 f 로 읽힌다
+        if cmd == 'a':
+            cuckoo.insert(key)
+        elif cmd == 'f':
+            cuckoo.delete(key)
 
     cuckoo.print_stats(start_time)
@@ -1,45 +1,80 @@
 import time
-from node import Node
-from redBlackTree import RedBlackTree
+from arrayRedBlackTree import ArrayRedBlackTree
 
 class Allocator:
-    def __init__(self):
+    def __init__(self, fit="first"):
         """
         Allocator 클래스 초기화:
         - chunk_size: 16KB로 설정
-        - free_tree: 자유 공간을 관리하는 Red-Black Tree
+        - free_tree: 자유 공간을 관리하는 Red-Black Tree (노드를 병렬 배열에 저장)
         - allocated_blocks: 할당된 블록을 저장하는 딕셔너리
         - total_memory: 총 할당된 메모리 크기
         - used_memory: 사용 중인 메모리 크기
-        - merge_interval: 병합 주기 (초기값 100)
-        - request_count: 요청 수
+        - fit: "first" 면 가장 낮은 주소의 맞는 블록 (O(log n)), "best" 면 가장 작은 맞는 블록
+               (best 는 맞는 서브 트리를 모두 훑어 최악 O(n) 이므로 비교 실험용)
+        - realloc_in_place / realloc_moved / copied_bytes: realloc 이 제자리에서 끝난 수, 옮긴 수, 옮기며 복사한 바이트
         """
         self.chunk_size = 16 * 1024  # 16KB
-        self.free_tree = RedBlackTree()
+        self.free_tree = ArrayRedBlackTree()
         self.allocated_blocks = {}
         self.total_memory = 0
         self.used_memory = 0
-        self.merge_interval = 100  # 초기 병합 주기
-        self.request_count = 0
+        self.fit = fit
+        self.realloc_in_place = 0
+        self.realloc_moved = 0
+        self.copied_bytes = 0
 
     def _allocate_new_chunk(self):
         """
         새로운 메모리 청크를 할당하여 free_tree에 삽입
+        - arena 끝의 자유 블록과 바로 병합
         """
-        self.free_tree.insert(self.total_memory, self.chunk_size)
+        self._insert_free(self.total_memory, self.chunk_size)
         self.total_memory += self.chunk_size
 
-    def _check_and_merge(self):
+    def _insert_free(self, start, size):
         """
-        주기적으로 병합을 수행
-        - merge_interval에 도달하면 병합 수행
-        - 병합 후 merge_interval 줄임
+        자유 블록을 주소상 이웃한 자유 블록과 병합한 뒤 free_tree에 삽입
+        - predecessor/successor 검색으로 이웃을 찾으므로 O(log n)
+        - 크기 0 구간(malloc(id, 0) 의 해제)은 다른 노드와 시작 주소가 겹치므로 넣지 않음
         """
-        self.request_count += 1
-        if self.request_count >= self.merge_interval:
-            self.merge()
-            self.request_count = 0
-            self.merge_interval = max(10, self.merge_interval // 2)  # 병합 주기 줄이기
+        if size == 0:
+            return
+        tree = self.free_tree
+        pred = tree.predecessor(start)
+        succ = tree.successor(start)
+        if pred and tree.start[pred] + tree.size[pred] == start:
+            start, size = tree.start[pred], tree.size[pred] + size
+            tree.delete(start)
+        if succ and start + size == tree.start[succ]:
+            size += tree.size[succ]
+            tree.delete(tree.start[succ])
+        tree.insert(start, size)
+
+    def _take(self, size, alignment=1):
+        """
+        free_tree 에서 alignment 배수 주소로 시작하는 size 바이트를 떼어 내고 시작 주소를 반환
+        - 적합한 블록이 없으면 새로운 청크 할당
+        - 정렬로 앞에 남는 부분과 뒤에 남는 부분은 다시 free_tree 에 삽입
+        """
+        tree = self.free_tree
+        need = size + alignment - 1
+        while True:
+            if self.fit == "best":
+                block = tree.search_best_fit(need)
+            else:
+                block = tree.search(need)
+            if block:
+                break
+            self._allocate_new_chunk()
+        start, block_size = tree.start[block], tree.size[block]
+        tree.delete(start)
+        aligned = (start + alignment - 1) & -alignment
+        if aligned > start:
+            tree.insert(start, aligned - start)
+        if block_size > aligned - start + size:
+            tree.insert(aligned + size, start + block_size - aligned - size)
+        return aligned
 
     def malloc(self, id, size):
         """
@@ -47,54 +82,93 @@ class Allocator:
         - 요청한 크기 이상의 블록을 free_tree에서 검색
         - 적합한 블록이 없으면 새로운 청크 할당
         - 적합한 블록이 있으면 블록 할당 및 분할 후 나머지 삽입
+        - 할당한 블록의 시작 주소를 반환
         """
-        while True:
-            block = self.free_tree.search(size)
-            if block and block != self.free_tree.NIL_LEAF:
-                self.free_tree.delete(block.start)
-                if block.size > size:
-                    self.free_tree.insert(block.start + size, block.size - size)
-                self.allocated_blocks[id] = (block.start, size)
-                self.used_memory += size
-                break
-            else:
+        start = self._take(size)
+        self.allocated_blocks[id] = (start, size)
+        self.used_memory += size
+        return start
+
+    def aligned_alloc(self, id, size, alignment):
+        """
+        시작 주소가 alignment(2의 거듭제곱) 배수인 블록 할당
+        - size + alignment - 1 이상의 블록을 찾아 정렬된 위치부터 잘라 씀
+        """
+        if alignment <= 0 or alignment & (alignment - 1):
+            raise ValueError("alignment must be a power of two")
+        start = self._take(size, alignment)
+        self.allocated_blocks[id] = (start, size)
+        self.used_memory += size
+        return start
+
+    def realloc(self, id, size):
+        """
+        블록 크기 변경 후 (새) 시작 주소 반환
+        - 줄일 때: 뒷부분을 잘라 이웃 자유 블록과 병합
+        - 늘릴 때: 주소상 바로 뒤 자유 블록(arena 끝이면 새 청크 포함)을 붙여 제자리에서 늘림
+        - 그래도 모자라면 먼저 해제한 뒤 새 자리를 잡음. 새 자리는 원래 자리와 겹칠 수 있으므로
+          내용은 memmove 처럼 옮겨야 함
+        """
+        if id not in self.allocated_blocks:
+            return self.malloc(id, size)
+        tree = self.free_tree
+        start, old_size = self.allocated_blocks[id]
+        end = start + old_size
+        if size <= old_size:
+            if size < old_size:
+                self._insert_free(start + size, old_size - size)
+            self.realloc_in_place += 1
+        else:
+            need = size - old_size
+            block = tree.find(end)
+            available = tree.size[block] if block else 0
+            while available < need and end + available == self.total_memory:
+                # arena 끝 블록이면 청크를 붙여 늘림 (끝의 자유 블록과 병합됨)
                 self._allocate_new_chunk()
-            self._check_and_merge()
+                block = tree.find(end)
+                available = tree.size[block]
+            if available >= need:
+                tree.delete(end)
+                if available > need:
+                    tree.insert(start + size, available - need)
+                self.realloc_in_place += 1
+            else:
+                self._insert_free(start, old_size)
+                start = self._take(size)
+                self.realloc_moved += 1
+                self.copied_bytes += old_size
+        self.allocated_blocks[id] = (start, size)
+        self.used_memory += size - old_size
+        return start
 
     def free(self, id):
         """
         메모리 해제 요청 처리
         - 요청된 블록을 allocated_blocks에서 제거
-        - free_tree에 해제된 블록 삽입
-        - 해제 후 병합 조건 검사
+        - 인접한 자유 블록과 즉시 병합하여 free_tree에 삽입
         """
         if id in self.allocated_blocks:
             start, size = self.allocated_blocks.pop(id)
-            self.free_tree.insert(start, size)
+            self._insert_free(start, size)
             self.used_memory -= size
-            self._check_and_merge()
         else:
             print(f"Block with ID {id} not found")
 
-    def merge(self):
+    def fragmentation(self):
         """
-        인접한 자유 블록들을 병합
-        - 중위 순회를 통해 자유 블록을 가져옴
-        - 인접한 블록 병합
-        - 병합 후 새로운 Red-Black Tree에 삽입
+        자유 블록 통계를 free_tree 를 한 번 훑어 계산
+        - 반환: (자유 블록 수, 자유 바이트, 가장 큰 자유 블록, 외부 단편화)
+        - 외부 단편화 = 1 - 가장 큰 자유 블록 / 자유 바이트
         """
-        nodes = self.free_tree.inorder()
-        if not nodes:
-            return
-        merged_nodes = [nodes[0]]
-        for i in range(1, len(nodes)):
-            if merged_nodes[-1].start + merged_nodes[-1].size == nodes[i].start:
-                merged_nodes[-1].size += nodes[i].size
-            else:
-                merged_nodes.append(nodes[i])
-        self.free_tree = RedBlackTree()
-        for node in merged_nodes:
-            self.free_tree.insert(node.start, node.size)
+        tree = self.free_tree
+        count = 0
+        free_bytes = 0
+        for node in tree.iter_inorder():
+            count += 1
+            free_bytes += tree.size[node]
+        largest = tree.max_size[tree.root]
+        external = 1 - largest / free_bytes if free_bytes > 0 else 0
+        return count, free_bytes, largest, external
 
     def print_stats(self):
         """
@@ -103,28 +177,37 @@ class Allocator:
         total_arena = self.total_memory / (1024 * 1024)
         in_use = self.used_memory / (1024 * 1024)
         utilization = self.used_memory / self.total_memory if self.total_memory > 0 else 0
+        count, free_bytes, largest, external = self.fragmentation()
         print(f"Arena: {total_arena:.2f} MB")
         print(f"In-use: {in_use:.2f} MB")
         print(f"Utilization: {utilization:.2%}")
+        print(f"Free blocks: {count} ({free_bytes / 1024:.1f} KB, largest {largest / 1024:.1f} KB)")
+        print(f"External fragmentation: {external:.2%}")
 
 if __name__ == "__main__":
-    import time
+    import os
+    import sys
+    # 요청은 team_project/alloc_trace 로 읽어 .atrc 캐시를 재사용한다
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+    from alloc_trace import iter_requests
+
     allocator = Allocator()
-    
+    path = sys.argv[1] if len(sys.argv) > 1 else "./input.txt"
+
     start_time = time.time()
-    with open("./input.txt", "r") as file:
-        n = 0
-        for line in file:
-            req = line.split()
-            if req[0] == 'a':
-                allocator.malloc(int(req[1]), int(req[2]))
-            elif req[0] == 'f':
-                allocator.free(int(req[1]))
+    n = 0
+    for op, id, size in iter_requests(path):
+        if op == 'a':
+            allocator.malloc(id, size)
+        elif op == 'f':
+            allocator.free(id)
+        elif op == 'r':
+            allocator.realloc(id, size)
+
+        if n % 100 == 0:
+            print(n, "...")
 
-            if n % 100 == 0:
-                print(n, "...")
-            
-            n += 1
+        n += 1
     
     end_time = time.time()
     allocator.print_stats()
@@ -0,0 +1,490 @@
+from array import array
+from node import RED, BLACK
+
+class ArrayRedBlackTree:
+    def __init__(self):
+        """
+        노드 객체 대신 병렬 배열(struct-of-arrays)에 노드를 저장하는 Red-Black 트리
+
+        노드는 배열 인덱스로 가리키고, 0 번 인덱스가 NIL_LEAF 입니다.
+        start/size/max_size : 노드별 값을 담은 array('q')
+        left/right/parent : 노드 인덱스를 담은 array('i')
+        color : 노드별 색상 (RED / BLACK) 을 담은 bytearray
+        free_index : 삭제된 노드 인덱스의 free list 머리 (left 배열로 연결, 0 이면 비어 있음)
+
+        insert/delete/search/search_best_fit/predecessor/successor 는 RedBlackTree 와 같고,
+        노드 대신 인덱스를 돌려주므로 값은 tree.start[i], tree.size[i] 로 읽습니다.
+        노드 하나에 8바이트 값 3개, 4바이트 링크 3개, 색상 1바이트만 쓰므로 노드 객체보다 메타데이터가 훨씬 작습니다.
+        """
+        self.NIL_LEAF = 0
+        self.root = 0
+        self.start = array('q', [0])
+        self.size = array('q', [0])
+        self.max_size = array('q', [0])
+        self.left = array('i', [0])
+        self.right = array('i', [0])
+        self.parent = array('i', [0])
+        self.color = bytearray([BLACK])
+        self.free_index = 0
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    def _new_node(self, start, size):
+        """
+        free list 에서 인덱스를 재사용하거나 배열 끝에 새 노드를 추가하는 내부 메소드
+
+        반환 : 새 노드의 인덱스 (색은 RED, 자식은 NIL_LEAF)
+        """
+        i = self.free_index
+        if i:
+            self.free_index = self.left[i]
+            self.start[i] = start
+            self.size[i] = size
+            self.max_size[i] = size
+            self.left[i] = 0
+            self.right[i] = 0
+            self.parent[i] = 0
+            self.color[i] = RED
+            return i
+        self.start.append(start)
+        self.size.append(size)
+        self.max_size.append(size)
+        self.left.append(0)
+        self.right.append(0)
+        self.parent.append(0)
+        self.color.append(RED)
+        return len(self.start) - 1
+
+    def insert(self, start, size):
+        """
+        새로운 노드 삽입
+
+        start : 메모리 블록의 시작 주소
+        size : 메모리 블록의 크기
+
+        반환 : 삽입된 노드의 인덱스
+        """
+        z = self._new_node(start, size)
+        left, right, starts = self.left, self.right, self.start
+        y = 0
+        x = self.root
+        while x:
+            y = x
+            x = left[x] if start < starts[x] else right[x]
+        self.parent[z] = y
+        if not y:
+            self.root = z
+        elif start < starts[y]:
+            left[y] = z
+        else:
+            right[y] = z
+        self._update_path(y)
+        self._fix_insert(z)
+        self.count += 1
+        return z
+
+    def _update_max(self, n):
+        """
+        자식들의 max_size 로부터 노드 n 의 max_size 를 다시 계산하는 내부 메소드
+        """
+        max_size = self.max_size
+        max_size[n] = max(self.size[n], max_size[self.left[n]], max_size[self.right[n]])
+
+    def _update_path(self, n, until=0):
+        """
+        노드 n 부터 루트 쪽으로 올라가며 max_size 를 갱신하는 내부 메소드
+        값이 그대로인 노드를 만나면 그 위도 바뀌지 않으므로 멈춥니다.
+        단, until 노드까지는 자리를 옮긴 노드가 있을 수 있어 끝까지 다시 계산합니다.
+
+        n : 갱신을 시작할 노드
+        until : 반드시 다시 계산해야 하는 가장 위쪽 노드 (없으면 NIL_LEAF)
+        """
+        size, max_size, left, right, parent = self.size, self.max_size, self.left, self.right, self.parent
+        while n:
+            m = size[n]
+            child = max_size[left[n]]
+            if child > m:
+                m = child
+            child = max_size[right[n]]
+            if child > m:
+                m = child
+            if m == max_size[n] and not until:
+                break
+            max_size[n] = m
+            if n == until:
+                until = 0
+            n = parent[n]
+
+    def _fix_insert(self, k):
+        """
+        삽입 후, Red-Black 트리의 속성을 유지하기 위해 트리를 수선하는 내부 메소드
+
+        k : 삽입된 노드
+        """
+        color, parent, left, right = self.color, self.parent, self.left, self.right
+        while k != self.root and color[parent[k]] == RED:
+            p = parent[k]
+            g = parent[p]
+            if p == left[g]:
+                u = right[g]
+                if color[u] == RED:
+                    color[p] = BLACK
+                    color[u] = BLACK
+                    color[g] = RED
+                    k = g
+                else:
+                    if k == right[p]:
+                        k = p
+                        self._left_rotate(k)
+                    p = parent[k]
+                    g = parent[p]
+                    color[p] = BLACK
+                    color[g] = RED
+                    self._right_rotate(g)
+            else:
+                u = left[g]
+                if color[u] == RED:
+                    color[p] = BLACK
+                    color[u] = BLACK
+                    color[g] = RED
+                    k = g
+                else:
+                    if k == left[p]:
+                        k = p
+                        self._right_rotate(k)
+                    p = parent[k]
+                    g = parent[p]
+                    color[p] = BLACK
+                    color[g] = RED
+                    self._left_rotate(g)
+        color[self.root] = BLACK
+
+    def _left_rotate(self, x):
+        """
+        수선 위해 좌회전 수행하는 내부 메서드
+
+        x : 회전의 중심 노드
+        """
+        left, right, parent = self.left, self.right, self.parent
+        y = right[x]
+        right[x] = left[y]
+        if left[y]:
+            parent[left[y]] = x
+        parent[y] = parent[x]
+        if not parent[x]:
+            self.root = y
+        elif x == left[parent[x]]:
+            left[parent[x]] = y
+        else:
+            right[parent[x]] = y
+        left[y] = x
+        parent[x] = y
+        self._update_max(x)
+        self._update_max(y)
+
+    def _right_rotate(self, x):
+        """
+        수선위해 우회전 수행 메소드
+
+        x : 회전의 중심 노드
+        """
+        left, right, parent = self.left, self.right, self.parent
+        y = left[x]
+        left[x] = right[y]
+        if right[y]:
+            parent[right[y]] = x
+        parent[y] = parent[x]
+        if not parent[x]:
+            self.root = y
+        elif x == right[parent[x]]:
+            right[parent[x]] = y
+        else:
+            left[parent[x]] = y
+        right[y] = x
+        parent[x] = y
+        self._update_max(x)
+        self._update_max(y)
+
+    def find(self, start):
+        """
+        시작 주소가 start 인 노드 검색
+
+        반환 : 노드의 인덱스 (없으면 NIL_LEAF)
+        """
+        starts, left, right = self.start, self.left, self.right
+        node = self.root
+        while node and starts[node] != start:
+            node = left[node] if start < starts[node] else right[node]
+        return node
+
+    def delete(self, start):
+        """
+        특정 시작 주소 가진 노드 삭제 후 인덱스를 free list 에 반환
+
+        start : 삭제할 노드의 시작 주소
+        """
+        z = self.find(start)
+        if z:
+            self._delete(z)
+            self.left[z] = self.free_index
+            self.free_index = z
+            self.count -= 1
+
+    def _delete(self, z):
+        """
+        트리에서 노드를 삭제하는 내부 메소드
+
+        z : 지정된 삭제할 노드
+        """
+        left, right, parent, color = self.left, self.right, self.parent, self.color
+        y = z
+        y_original_color = color[y]
+        if not left[z]:
+            x = right[z]
+            self._rb_transplant(z, x)
+        elif not right[z]:
+            x = left[z]
+            self._rb_transplant(z, x)
+        else:
+            y = self._minimum(right[z])
+            y_original_color = color[y]
+            x = right[y]
+            if parent[y] == z:
+                parent[x] = y
+            else:
+                self._rb_transplant(y, right[y])
+                right[y] = right[z]
+                parent[right[y]] = y
+            self._rb_transplant(z, y)
+            left[y] = left[z]
+            parent[left[y]] = y
+            color[y] = color[z]
+        # 구조가 바뀐 x 의 부모부터 max_size 갱신. 자리를 옮긴 y 는 값이 낡았으므로 y 까지는 반드시 갱신
+        self._update_path(parent[x], y if y != z else 0)
+        if y_original_color == BLACK:
+            self._fix_delete(x)
+
+    def _fix_delete(self, x):
+        """
+        삭제 후 Red-Black 트리의 속성을 유지하기 위해 트리를 수정하는 내부 메소드
+
+        x : 삭제된 노드의 자리를 채운 노드
+        """
+        left, right, parent, color = self.left, self.right, self.parent, self.color
+        while x != self.root and color[x] == BLACK:
+            p = parent[x]
+            if x == left[p]:
+                w = right[p]
+                if color[w] == RED:
+                    color[w] = BLACK
+                    color[p] = RED
+                    self._left_rotate(p)
+                    w = right[p]
+                if color[left[w]] == BLACK and color[right[w]] == BLACK:
+                    color[w] = RED
+                    x = p
+                else:
+                    if color[right[w]] == BLACK:
+                        color[left[w]] = BLACK
+                        color[w] = RED
+                        self._right_rotate(w)
+                        w = right[p]
+                    color[w] = color[p]
+                    color[p] = BLACK
+                    color[right[w]] = BLACK
+                    self._left_rotate(p)
+                    x = self.root
+            else:
+                w = left[p]
+                if color[w] == RED:
+                    color[w] = BLACK
+                    color[p] = RED
+                    self._right_rotate(p)
+                    w = left[p]
+                if color[left[w]] == BLACK and color[right[w]] == BLACK:
+                    color[w] = RED
+                    x = p
+                else:
+                    if color[left[w]] == BLACK:
+                        color[right[w]] = BLACK
+                        color[w] = RED
+                        self._left_rotate(w)
+                        w = left[p]
+                    color[w] = color[p]
+                    color[p] = BLACK
+                    color[left[w]] = BLACK
+                    self._right_rotate(p)
+                    x = self.root
+        color[x] = BLACK
+
+    def _rb_transplant(self, u, v):
+        """
+        트리에서 두 노드의 자리를 교체하는 내부 메소드
+
+        u, v : 교체될 노드
+        """
+        left, right, parent = self.left, self.right, self.parent
+        p = parent[u]
+        if not p:
+            self.root = v
+        elif u == left[p]:
+            left[p] = v
+        else:
+            right[p] = v
+        parent[v] = p
+
+    def _minimum(self, node):
+        """
+        특정 서브 트리에서 가장 작은 값을 가진 노드를 찾는 내부 메소드
+
+        node : 서브 트리의 루트 노드
+        """
+        left = self.left
+        while left[node]:
+            node = left[node]
+        return node
+
+    def predecessor(self, start):
+        """
+        시작 주소가 start 보다 작은 노드 중 가장 큰 노드 검색 (없으면 NIL_LEAF)
+        """
+        starts, left, right = self.start, self.left, self.right
+        node = self.root
+        result = 0
+        while node:
+            if starts[node] < start:
+                result = node
+                node = right[node]
+            else:
+                node = left[node]
+        return result
+
+    def successor(self, start):
+        """
+        시작 주소가 start 보다 큰 노드 중 가장 작은 노드 검색 (없으면 NIL_LEAF)
+        """
+        starts, left, right = self.start, self.left, self.right
+        node = self.root
+        result = 0
+        while node:
+            if starts[node] > start:
+                result = node
+                node = left[node]
+            else:
+                node = right[node]
+        return result
+
+    def search(self, size):
+        """
+        주어진 크기 이상의 메모리 블록 중 시작 주소가 가장 낮은 블록 검색
+
+        size : 검색할 메모리 블록의 크기
+
+        반환 : 노드의 인덱스 (없으면 NIL_LEAF)
+        """
+        sizes, max_size, left, right = self.size, self.max_size, self.left, self.right
+        node = self.root
+        while node and max_size[node] >= size:
+            # NIL_LEAF 의 max_size 는 0 이라 size 가 0 이면 조건이 참이 되므로 실제 노드인지도 확인
+            if left[node] and max_size[left[node]] >= size:
+                node = left[node]
+            elif sizes[node] >= size:
+                return node
+            else:
+                node = right[node]
+        return 0
+
+    def search_best_fit(self, size):
+        """
+        주어진 크기 이상의 메모리 블록 중 크기가 가장 작은 블록 검색
+        (같은 크기면 시작 주소가 낮은 블록)
+        RedBlackTree.search_best_fit 과 같이 맞는 블록이 많으면 O(n) 이다.
+
+        size : 검색할 메모리 블록의 크기
+        """
+        sizes, starts, max_size, left, right = self.size, self.start, self.max_size, self.left, self.right
+        best = 0
+        stack = [self.root]
+        while stack:
+            node = stack.pop()
+            if not node or max_size[node] < size:
+                continue
+            if sizes[node] >= size and (not best or (sizes[node], starts[node]) < (sizes[best], starts[best])):
+                best = node
+                if sizes[node] == size and max_size[left[node]] < size:
+                    continue
+            stack.append(right[node])
+            stack.append(left[node])
+        return best
+
+    def floor(self, start):
+        """
+        시작 주소가 start 이하인 노드 중 가장 큰 노드 검색 (없으면 NIL_LEAF)
+        """
+        starts, left, right = self.start, self.left, self.right
+        node = self.root
+        result = 0
+        while node:
+            if starts[node] == start:
+                return node
+            if starts[node] < start:
+                result = node
+                node = right[node]
+            else:
+                node = left[node]
+        return result
+
+    def ceiling(self, start):
+        """
+        시작 주소가 start 이상인 노드 중 가장 작은 노드 검색 (없으면 NIL_LEAF)
+        """
+        starts, left, right = self.start, self.left, self.right
+        node = self.root
+        result = 0
+        while node:
+            if starts[node] == start:
+                return node
+            if starts[node] > start:
+                result = node
+                node = left[node]
+            else:
+                node = right[node]
+        return result
+
+    def iter_inorder(self):
+        """
+        시작 주소 순으로 노드 인덱스를 하나씩 내보내는 제너레이터 (추가 메모리 O(log n))
+        """
+        return self.iter_range(None, None)
+
+    def iter_range(self, lo, hi):
+        """
+        lo <= start < hi 인 노드 인덱스를 시작 주소 순으로 내보내는 제너레이터
+
+        lo, hi : 주소 범위 (None 이면 그쪽 끝은 제한 없음)
+        """
+        starts, left, right = self.start, self.left, self.right
+        stack = []
+        node = self.root
+        while True:
+            while node:
+                if lo is not None and starts[node] < lo:
+                    node = right[node]
+                else:
+                    stack.append(node)
+                    node = left[node]
+            if not stack:
+                return
+            node = stack.pop()
+            if hi is not None and starts[node] >= hi:
+                return
+            yield node
+            node = right[node]
+
+    def inorder(self):
+        """
+        중위 순회한 노드 인덱스의 리스트
+        """
+        return list(self.iter_inorder())
@@ -1,17 +1,25 @@
+RED = 1
+BLACK = 0
+
 class Node:
-    def __init__(self, start, size, color="red"):
+    # 인스턴스마다 __dict__ 를 두지 않도록 필드를 고정
+    __slots__ = ("start", "size", "color", "max_size", "parent", "left", "right")
+
+    def __init__(self, start, size, color=RED):
         """
         Red-Black 트리에서 사용되는 노드를 정의
 
         start : 메모리 블록의 시작 주소
         size : 메모리 블록의 크기
-        color : 노드의 색상 (기본값 : red)
+        color : 노드의 색상 RED / BLACK (기본값 : RED)
+        max_size : 서브 트리에 있는 블록 중 가장 큰 크기
         parent : 부모 노드
         left/right : 왼쪽/오른쪽 자식 노드
         """
         self.start = start
         self.size = size
         self.color = color  # Red or Black
+        self.max_size = size
         self.parent = None
         self.left = None
         self.right = None
@@ -10,7 +10,7 @@ class RedBlackTree:
         
         Red-Black 트리의 속성 : 루트/리프 노드는 모두 Black
         """
-        self.NIL_LEAF = Node(0, 0, color="black")
+        self.NIL_LEAF = Node(0, 0, color=BLACK)
         self.root = self.NIL_LEAF
 
     def insert(self, start, size):
@@ -50,7 +50,27 @@ class RedBlackTree:
             y.left = new_node
         else:
             y.right = new_node
-        new_node.color = "red"
+        new_node.color = RED
+        new_node.max_size = new_node.size
+        self._update_path(y)
+
+    def _update_max(self, node):
+        """
+        자식들의 max_size 로부터 노드의 max_size 를 다시 계산하는 내부 메소드
+
+        node : 갱신할 노드
+        """
+        node.max_size = max(node.size, node.left.max_size, node.right.max_size)
+
+    def _update_path(self, node):
+        """
+        node 부터 루트까지 올라가며 max_size 를 갱신하는 내부 메소드
+
+        node : 갱신을 시작할 노드
+        """
+        while node != self.NIL_LEAF:
+            self._update_max(node)
+            node = node.parent
 
     def _fix_insert(self, k):
         """
@@ -59,15 +79,15 @@ class RedBlackTree:
         k : 삽입된 노드
         """
         # k 의 parent 가 red 일 경우만 수선 작업이 필요함 (조건 맞을 때까지 반복)
-        while k != self.root and k.parent.color == "red":
+        while k != self.root and k.parent.color == RED:
             # parent 의 형제노드 파악 위해 parent 노드가 어딨는지 확인
             if k.parent == k.parent.parent.left:
                 u = k.parent.parent.right # parent 의 형제노드
                 # parent 의 형제노드가 Red 일 경우, parent 와 형제노드 Black 로 바꾸고, p^2 노드를 Red 로 변경후, 새롭게 삽입된 노드로 취급 
-                if u.color == "red":
-                    k.parent.color = "black"
-                    u.color = "black"
-                    k.parent.parent.color = "red"
+                if u.color == RED:
+                    k.parent.color = BLACK
+                    u.color = BLACK
+                    k.parent.parent.color = RED
                     k = k.parent.parent
                 # parent 의 형제노드가 Black 일 경우
                 else:
@@ -76,25 +96,25 @@ class RedBlackTree:
                         k = k.parent
                         self._left_rotate(k)
                     # 왼쪽 자식일 경우, parent 의 parent 을 기준으로 우회전 후 parent 와 parent, parent 의 색상 바꿈
-                    k.parent.color = "black"
-                    k.parent.parent.color = "red"
+                    k.parent.color = BLACK
+                    k.parent.parent.color = RED
                     self._right_rotate(k.parent.parent)
             # parent 의 형제노드 파악 위해 parent 노드가 어딨는지 확인
             else:
                 u = k.parent.parent.left # parent 의 형제노드
-                if u.color == "red":
-                    k.parent.color = "black"
-                    u.color = "black"
-                    k.parent.parent.color = "red"
+                if u.color == RED:
+                    k.parent.color = BLACK
+                    u.color = BLACK
+                    k.parent.parent.color = RED
                     k = k.parent.parent
                 else:
                     if k == k.parent.left:
                         k = k.parent
                         self._right_rotate(k)
-                    k.parent.color = "black"
-                    k.parent.parent.color = "red"
+                    k.parent.color = BLACK
+                    k.parent.parent.color = RED
                     self._left_rotate(k.parent.parent)
-        self.root.color = "black"
+        self.root.color = BLACK
 
     def _left_rotate(self, x):
         """
@@ -115,6 +135,9 @@ class RedBlackTree:
             x.parent.right = y
         y.left = x
         x.parent = y
+        # 회전 후 아래쪽이 된 x 부터 max_size 갱신
+        self._update_max(x)
+        self._update_max(y)
 
     def _right_rotate(self, x):
         """
@@ -135,6 +158,8 @@ class RedBlackTree:
             x.parent.left = y
         y.right = x
         x.parent = y
+        self._update_max(x)
+        self._update_max(y)
 
     def delete(self, start):
         """
@@ -175,7 +200,9 @@ class RedBlackTree:
             y.left = z.left
             y.left.parent = y
             y.color = z.color
-        if y_original_color == "black":
+        # 구조가 바뀐 x 의 부모부터 루트까지 max_size 갱신
+        self._update_path(x.parent)
+        if y_original_color == BLACK:
             self._fix_delete(x)
 
     def _fix_delete(self, x):
@@ -184,50 +211,50 @@ class RedBlackTree:
 
         x : 삭제된 노드의 자리를 채운 노드
         """
-        while x != self.root and x.color == "black":
+        while x != self.root and x.color == BLACK:
             if x == x.parent.left:
                 w = x.parent.right
-                if w.color == "red":
-                    w.color = "black"
-                    x.parent.color = "red"
+                if w.color == RED:
+                    w.color = BLACK
+                    x.parent.color = RED
                     self._left_rotate(x.parent)
                     w = x.parent.right
-                if w.left.color == "black" and w.right.color == "black":
-                    w.color = "red"
+                if w.left.color == BLACK and w.right.color == BLACK:
+                    w.color = RED
                     x = x.parent
                 else:
-                    if w.right.color == "black":
-                        w.left.color = "black"
-                        w.color = "red"
+                    if w.right.color == BLACK:
+                        w.left.color = BLACK
+                        w.color = RED
                         self._right_rotate(w)
                         w = x.parent.right
                     w.color = x.parent.color
-                    x.parent.color = "black"
-                    w.right.color = "black"
+                    x.parent.color = BLACK
+                    w.right.color = BLACK
                     self._left_rotate(x.parent)
                     x = self.root
             else:
                 w = x.parent.left
-                if w.color == "red":
-                    w.color = "black"
-                    x.parent.color = "red"
+                if w.color == RED:
+                    w.color = BLACK
+                    x.parent.color = RED
                     self._right_rotate(x.parent)
                     w = x.parent.left
-                if w.left.color == "black" and w.right.color == "black":
-                    w.color = "red"
+                if w.left.color == BLACK and w.right.color == BLACK:
+                    w.color = RED
                     x = x.parent
                 else:
-                    if w.left.color == "black":
-                        w.right.color = "black"
-                        w.color = "red"
+                    if w.left.color == BLACK:
+                        w.right.color = BLACK
+                        w.color = RED
                         self._left_rotate(w)
                         w = x.parent.left
                     w.color = x.parent.color
-                    x.parent.color = "black"
-                    w.left.color = "black"
+                    x.parent.color = BLACK
+                    w.left.color = BLACK
                     self._right_rotate(x.parent)
                     x = self.root
-        x.color = "black"
+        x.color = BLACK
 
     def _rb_transplant(self, u, v):
         """
@@ -245,18 +272,16 @@ class RedBlackTree:
 
     def _search_tree_helper(self, node, key):
         """
-        트리에서 특정 키 값을 가진 노드를 검색하는 내부 메소드
+        트리에서 특정 키 값을 가진 노드를 검색하는 내부 메소드 (반복문으로 내려감)
 
-        node : 현재 노드
+        node : 검색을 시작할 노드
         key : 검색할 키 값
 
         반환 : 검색된 노드
         """
-        if node == self.NIL_LEAF or key == node.start:
-            return node
-        if key < node.start:
-            return self._search_tree_helper(node.left, key)
-        return self._search_tree_helper(node.right, key)
+        while node != self.NIL_LEAF and key != node.start:
+            node = node.left if key < node.start else node.right
+        return node
 
     def _minimum(self, node):
         """
@@ -268,41 +293,152 @@ class RedBlackTree:
             node = node.left
         return node
 
+    def predecessor(self, start):
+        """
+        시작 주소가 start 보다 작은 노드 중 가장 큰 노드 검색
+
+        start : 기준 시작 주소
+
+        검색된 노드 (없으면 NIL_LEAF)
+        """
+        node = self.root
+        result = self.NIL_LEAF
+        while node != self.NIL_LEAF:
+            if node.start < start:
+                result = node
+                node = node.right
+            else:
+                node = node.left
+        return result
+
+    def successor(self, start):
+        """
+        시작 주소가 start 보다 큰 노드 중 가장 작은 노드 검색
+
+        start : 기준 시작 주소
+
+        검색된 노드 (없으면 NIL_LEAF)
+        """
+        node = self.root
+        result = self.NIL_LEAF
+        while node != self.NIL_LEAF:
+            if node.start > start:
+                result = node
+                node = node.left
+            else:
+                node = node.right
+        return result
+
     def search(self, size):
         """
-        주어진 크기 이상의 메모리 블록 검색
+        주어진 크기 이상의 메모리 블록 중 시작 주소가 가장 낮은 블록 검색
 
         size : 검색할 메모리 블록의 크기
 
-        검색된 메모리 블록을 포함하는 노드
+        검색된 메모리 블록을 포함하는 노드 (없으면 NIL_LEAF)
         """
-        return self._search(self.root, size)
+        node = self.root
+        while node != self.NIL_LEAF and node.max_size >= size:
+            # 왼쪽 서브 트리에 맞는 블록이 있으면 그쪽이 주소가 더 낮다
+            # (NIL_LEAF 의 max_size 는 0 이라 size 가 0 이면 조건이 참이 되므로 실제 노드인지도 확인)
+            if node.left != self.NIL_LEAF and node.left.max_size >= size:
+                node = node.left
+            elif node.size >= size:
+                return node
+            else:
+                node = node.right
+        return self.NIL_LEAF
 
-    def _search(self, root, size):
+    def search_best_fit(self, size):
         """
-        주어진 크기 이상의 메모리 블록을 검색하는 내부 메소드
+        주어진 크기 이상의 메모리 블록 중 크기가 가장 작은 블록 검색
+        (같은 크기면 시작 주소가 낮은 블록)
+
+        트리가 start 순이라 크기로는 한쪽만 골라 내려갈 수 없어, max_size 가 size 이상인
+        서브 트리는 모두 방문한다. 큰 블록이 드물면 빠르지만 작은 요청처럼 거의 모든 블록이
+        맞으면 O(n) 이다. O(log n) 인 search 를 기본으로 쓰고 이쪽은 필요할 때만 고른다.
 
-        root : 현재 검색 진행중인 노드
         size : 검색할 메모리 블록의 크기
+        """
+        best = self.NIL_LEAF
+        stack = [self.root]
+        while stack:
+            node = stack.pop()
+            if node == self.NIL_LEAF or node.max_size < size:
+                continue
+            if node.size >= size and (best == self.NIL_LEAF or (node.size, node.start) < (best.size, best.start)):
+                best = node
+                if node.size == size and node.left.max_size < size:
+                    continue
+            stack.append(node.right)
+            stack.append(node.left)
+        return best
+
+    def floor(self, start):
+        """
+        시작 주소가 start 이하인 노드 중 가장 큰 노드 검색 (없으면 NIL_LEAF)
+        """
+        node = self.root
+        result = self.NIL_LEAF
+        while node != self.NIL_LEAF:
+            if node.start == start:
+                return node
+            if node.start < start:
+                result = node
+                node = node.right
+            else:
+                node = node.left
+        return result
 
-        검색된 메모리 블록을 가진 노드 반환
+    def ceiling(self, start):
+        """
+        시작 주소가 start 이상인 노드 중 가장 작은 노드 검색 (없으면 NIL_LEAF)
         """
-        if not root or root == self.NIL_LEAF or root.size >= size:
-            return root
-        if root.size < size:
-            return self._search(root.right, size)
-        return self._search(root.left, size)
+        node = self.root
+        result = self.NIL_LEAF
+        while node != self.NIL_LEAF:
+            if node.start == start:
+                return node
+            if node.start > start:
+                result = node
+                node = node.left
+            else:
+                node = node.right
+        return result
 
-    def inorder(self):
-        return self._inorder(self.root)
-        
-    def _inorder(self, root):
+    def iter_inorder(self):
+        """
+        시작 주소 순으로 노드를 하나씩 내보내는 제너레이터
+        높이만큼의 스택만 쓰므로 추가 메모리는 O(log n) 입니다.
         """
-        중위 순회를 통해 트리의 모든 노드를 리스트로 반환
+        return self.iter_range(None, None)
 
-        root : 현재 노드
-        list : 중위 순회된 노드들의 리스트
+    def iter_range(self, lo, hi):
+        """
+        lo <= start < hi 인 노드를 시작 주소 순으로 내보내는 제너레이터
+        lo 보다 작은 서브 트리는 건너뛰고, hi 에 닿으면 멈춥니다.
+
+        lo, hi : 주소 범위 (None 이면 그쪽 끝은 제한 없음)
+        """
+        stack = []
+        node = self.root
+        while True:
+            while node != self.NIL_LEAF:
+                if lo is not None and node.start < lo:
+                    node = node.right
+                else:
+                    stack.append(node)
+                    node = node.left
+            if not stack:
+                return
+            node = stack.pop()
+            if hi is not None and node.start >= hi:
+                return
+            yield node
+            node = node.right
+
+    def inorder(self):
+        """
+        중위 순회된 노드들의 리스트
         """
-        if root == self.NIL_LEAF:
-            return []
-        return self._inorder(root.left) + [root] + self._inorder(root.right)
+        return list(self.iter_inorder())